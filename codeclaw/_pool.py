@@ -0,0 +1,40 @@
+"""Opt-in process pools for CPU-bound batch work."""
+
+from __future__ import annotations
+
+import multiprocessing
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+# Upper bound on workers, so an opted-in pool still leaves cores free
+MAX_POOL_WORKERS = 4
+
+
+def pool_context():
+    """A start method that never forks the (possibly multithreaded) caller."""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def pool_map(
+    fn: Callable[[Any], Any],
+    items: Sequence[Any],
+    max_workers: int | None,
+    chunksize: int = 1,
+) -> list[Any] | None:
+    """Map *fn* over *items* in a process pool, keeping *items* order.
+
+    Pools are opt-in: returns None without starting one unless *max_workers*
+    is above 1 and there is more than one item, and also when no usable pool
+    can be started here. Callers then do the work in-process.
+    """
+    workers = min(len(items), max_workers or 1, MAX_POOL_WORKERS)
+    if workers <= 1:
+        return None
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context()) as pool:
+            return list(pool.map(fn, items, chunksize=chunksize))
+    except (OSError, NotImplementedError, BrokenProcessPool):
+        return None
@@ -1,5 +1,55 @@
 """Session trajectory classifier heuristics."""
 
+CORRECTION_SIGNALS = (
+    "wrong",
+    "error",
+    "that's not",
+    "fix",
+    "broken",
+    "failed",
+    "doesn't work",
+    "incorrect",
+    "bug",
+    "not what i",
+    "that won't",
+    "not right",
+)
+DEBUG_TOOLS = ("bash", "python", "execute")
+REFACTOR_SIGNALS = ("refactor", "clean up", "rewrite", "simplify", "restructure", "reorganize", "consolidate")
+ERROR_OUTPUT_SIGNALS = ("error", "traceback")
+
+# ---------------------------------------------------------------------------
+# Signal matchers — ahocorasick_rs when installed (codeclaw[fast]), plain
+# substring tests otherwise; callers pass already-lowercased text.
+# ---------------------------------------------------------------------------
+
+try:
+    from ahocorasick_rs import AhoCorasick, MatchKind  # type: ignore
+except ImportError:
+    AhoCorasick = None
+
+
+if AhoCorasick is not None:  # pragma: no cover — ahocorasick_rs optional
+    def _compile_matcher(signals: tuple[str, ...]):
+        automaton = AhoCorasick(list(signals), matchkind=MatchKind.LeftmostFirst)
+
+        def _matches(text: str) -> bool:
+            return bool(automaton.find_matches_as_indexes(text))
+
+        return _matches
+
+else:
+    def _compile_matcher(signals: tuple[str, ...]):
+        def _matches(text: str) -> bool:
+            return any(sig in text for sig in signals)
+
+        return _matches
+
+
+_has_correction_signal = _compile_matcher(CORRECTION_SIGNALS)
+_has_refactor_signal = _compile_matcher(REFACTOR_SIGNALS)
+_has_error_output = _compile_matcher(ERROR_OUTPUT_SIGNALS)
+
 
 def classify_trajectory(session: dict) -> str:
     """
@@ -8,49 +58,38 @@ def classify_trajectory(session: dict) -> str:
     """
     messages = session.get("messages", [])
 
-    CORRECTION_SIGNALS = [
-        "wrong",
-        "error",
-        "that's not",
-        "fix",
-        "broken",
-        "failed",
-        "doesn't work",
-        "incorrect",
-        "bug",
-        "not what i",
-        "that won't",
-        "not right",
-    ]
-    DEBUG_TOOLS = ["bash", "python", "execute"]
-    REFACTOR_SIGNALS = ["refactor", "clean up", "rewrite", "simplify", "restructure", "reorganize", "consolidate"]
-
-    # Check for correction loop: user message after assistant that contains correction signal
+    # Single pass: a correction returns immediately; the remaining signals are
+    # accumulated and each is no longer computed once it has been seen.
+    has_bash = False
+    has_error_output = False
+    first_user_content: str | None = None
     for i, msg in enumerate(messages):
-        if msg.get("role") == "user" and i > 0:
+        role = msg.get("role")
+        if role == "user":
             content = str(msg.get("content", "")).lower()
-            if any(sig in content for sig in CORRECTION_SIGNALS):
+            # Correction loop: user message after assistant that contains correction signal
+            if i > 0 and _has_correction_signal(content):
                 return "correction_loop"
+            if first_user_content is None:
+                first_user_content = content
+            if not has_error_output:
+                has_error_output = _has_error_output(content)
+            continue
+
+        if role == "assistant" and not has_bash:
+            has_bash = any(
+                str(t.get("tool", "")).lower() in DEBUG_TOOLS for t in msg.get("tool_uses", [])
+            )
+        if not has_error_output:
+            has_error_output = _has_error_output(str(msg.get("content", "")).lower())
 
-    # Check for debugging trace: tool uses with bash + error outputs
-    has_bash = any(
-        any(str(t.get("tool", "")).lower() in DEBUG_TOOLS for t in msg.get("tool_uses", []))
-        for msg in messages if msg.get("role") == "assistant"
-    )
-    has_error_output = any(
-        "error" in str(msg.get("content", "")).lower()
-        or "traceback" in str(msg.get("content", "")).lower()
-        for msg in messages
-    )
+    # Debugging trace: tool uses with bash + error outputs
     if has_bash and has_error_output:
         return "debugging_trace"
 
     # Refactor
-    first_user = next((m for m in messages if m.get("role") == "user"), None)
-    if first_user:
-        content = str(first_user.get("content", "")).lower()
-        if any(sig in content for sig in REFACTOR_SIGNALS):
-            return "refactor"
+    if first_user_content is not None and _has_refactor_signal(first_user_content):
+        return "refactor"
 
     # Iterative build: long sessions with tool use but no corrections
     if len(messages) > 8 and has_bash:
@@ -10,7 +10,7 @@ from pathlib import Path
 
 from ..anonymizer import Anonymizer
 from ..classifier import classify_trajectory
-from ..config import CONFIG_FILE, CodeClawConfig, load_config, save_config
+from ..config import CONFIG_FILE, CodeClawConfig, get_synced_session_ids, load_config, save_config
 from ..parser import CLAUDE_DIR, CODEX_DIR, detect_current_project, discover_projects, parse_project_sessions
 from ..secrets import _has_mixed_char_types, _shannon_entropy, redact_session
 
@@ -77,7 +77,7 @@ def export_to_jsonl(
 ) -> dict:
     """Export selected projects to JSONL. Returns metadata."""
     config = load_config()
-    synced_session_ids = set(config.get("synced_session_ids", []))
+    synced_session_ids = get_synced_session_ids(config)
     total = 0
     skipped = 0
     total_redactions = 0
@@ -244,9 +244,10 @@ def push_to_huggingface(
         sys.exit(1)
 
     config = load_config()
-    synced = set(config.get("synced_session_ids", []))
-    synced.update(meta.get("exported_session_ids", []))
-    config["synced_session_ids"] = sorted(synced)
+    # save_config merges these into the synced-IDs sidecar
+    config["synced_session_ids"] = sorted(
+        {*config.get("synced_session_ids", []), *meta.get("exported_session_ids", [])}
+    )
     config["last_synced_at"] = datetime.now(tz=timezone.utc).isoformat()
     save_config(config)
 
@@ -8,7 +8,7 @@ from pathlib import Path
 from typing import Any
 
 from ..anonymizer import Anonymizer
-from ..config import CONFIG_FILE, CodeClawConfig, load_config, save_config
+from ..config import CONFIG_FILE, CodeClawConfig, get_synced_session_ids, load_config, save_config
 from ..parser import discover_projects, parse_project_sessions
 from ._helpers import (
     _filter_projects_by_source,
@@ -277,7 +277,7 @@ def handle_stats(args) -> None:
         for session in sessions
         if str(session.get("session_id", "")).strip()
     }
-    synced_ids = set(config.get("synced_session_ids", []))
+    synced_ids = get_synced_session_ids(config)
     pending_ids = session_ids - synced_ids
 
     total_input = sum(int(session.get("stats", {}).get("input_tokens", 0) or 0) for session in sessions)
@@ -1,15 +1,42 @@
 """Update-skill and synthesize subcommand helpers."""
 
+import hashlib
 import json
 import sys
+import urllib.error
 import urllib.request
 from pathlib import Path
 
+from ..config import CONFIG_DIR
 from ._helpers import SKILL_URL
 
+SKILL_META_FILE = CONFIG_DIR / "skill_meta.json"
+
+
+def _load_skill_meta() -> dict:
+    """Return the cached ETag/Last-Modified/sha256 of the last skill download."""
+    try:
+        meta = json.loads(SKILL_META_FILE.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+
+def _save_skill_meta(meta: dict) -> None:
+    try:
+        SKILL_META_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SKILL_META_FILE.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"Warning: could not save {SKILL_META_FILE}: {e}", file=sys.stderr)
+
 
 def update_skill(target: str) -> None:
-    """Download and install the codeclaw skill for a coding agent."""
+    """Download and install the codeclaw skill for a coding agent.
+
+    Uses a conditional GET against the cached ETag/Last-Modified when the
+    installed file still matches the last download, and skips rewriting the
+    file when the downloaded body is byte-identical.
+    """
     if target != "claude":
         print(f"Error: unknown target '{target}'. Supported: claude", file=sys.stderr)
         sys.exit(1)
@@ -17,22 +44,44 @@ def update_skill(target: str) -> None:
     dest = Path.cwd() / ".claude" / "skills" / "codeclaw" / "SKILL.md"
     dest.parent.mkdir(parents=True, exist_ok=True)
 
+    meta = _load_skill_meta()
+    existing = dest.read_bytes() if dest.exists() else None
+    existing_hash = hashlib.sha256(existing).hexdigest() if existing is not None else None
+
+    headers: dict[str, str] = {}
+    if existing_hash is not None and existing_hash == meta.get("sha256"):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
     print(f"Downloading skill from {SKILL_URL}...")
+    content: bytes | None = None
+    fresh_meta: dict | None = None
     try:
-        with urllib.request.urlopen(SKILL_URL, timeout=15) as resp:
-            content = resp.read().decode()
+        request = urllib.request.Request(SKILL_URL, headers=headers)
+        with urllib.request.urlopen(request, timeout=15) as resp:
+            content = resp.read()
+            fresh_meta = {
+                "etag": resp.headers.get("ETag"),
+                "last_modified": resp.headers.get("Last-Modified"),
+                "sha256": hashlib.sha256(content).hexdigest(),
+            }
+    except urllib.error.HTTPError as e:
+        if e.code != 304:
+            content = _bundled_skill_or_exit(e)
     except (OSError, urllib.error.URLError) as e:
-        print(f"Error downloading skill: {e}", file=sys.stderr)
-        # Fall back to bundled copy
-        bundled = Path(__file__).resolve().parent.parent.parent / "docs" / "SKILL.md"
-        if bundled.exists():
-            print(f"Using bundled copy from {bundled}")
-            content = bundled.read_text()
-        else:
-            print("No bundled copy available either.", file=sys.stderr)
-            sys.exit(1)
-
-    dest.write_text(content)
+        content = _bundled_skill_or_exit(e)
+
+    if content is None:
+        print("Skill is already up to date.")
+    elif existing_hash == hashlib.sha256(content).hexdigest():
+        print("Downloaded skill is unchanged; not rewriting.")
+    else:
+        dest.write_bytes(content)
+    if fresh_meta is not None and fresh_meta != meta:
+        _save_skill_meta(fresh_meta)
+
     print(f"Skill installed to {dest}")
     print(json.dumps({
         "installed": str(dest),
@@ -41,6 +90,17 @@ def update_skill(target: str) -> None:
     }, indent=2))
 
 
+def _bundled_skill_or_exit(error: Exception) -> bytes:
+    print(f"Error downloading skill: {error}", file=sys.stderr)
+    # Fall back to bundled copy
+    bundled = Path(__file__).resolve().parent.parent.parent / "docs" / "SKILL.md"
+    if bundled.exists():
+        print(f"Using bundled copy from {bundled}")
+        return bundled.read_bytes()
+    print("No bundled copy available either.", file=sys.stderr)
+    sys.exit(1)
+
+
 def _handle_synthesize(args) -> None:
     from ..synthesizer import synthesize_for_project
 
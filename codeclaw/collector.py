@@ -1,9 +1,10 @@
 """Collect and structure Claude Code session logs for CodeClaw."""
 
-from pathlib import Path
+from collections.abc import Iterator
 
+from . import parser
 from .anonymizer import Anonymizer
-from .config import CodeClawConfig
+from .config import CodeClawConfig, get_synced_session_ids
 from .parser import (
     CLAUDE_SOURCE,
     PROJECTS_DIR,
@@ -11,19 +12,84 @@ from .parser import (
     parse_project_sessions,
 )
 
+# (source, dir_name) -> (fingerprint, parsed sessions). Reused by repeated
+# collector calls (e.g. the watch loop) while a project's logs are unchanged.
+# Kept in least-recently-used order and capped at _PARSE_CACHE_MAX_PROJECTS.
+_PARSE_CACHE: dict[tuple[str, str], tuple[tuple, list[dict]]] = {}
+_PARSE_CACHE_MAX_PROJECTS = 64
 
-def collect_new_sessions(
+
+def _project_fingerprint(project: dict, usernames: tuple[str, ...]) -> tuple:
+    """Summarize a project's session files so any append, add or delete changes it."""
+    if project["source"] == CLAUDE_SOURCE:
+        session_files = list((parser.PROJECTS_DIR / project["dir_name"]).glob("*.jsonl"))
+    else:
+        session_files = parser._get_codex_project_index().get(project["dir_name"], [])
+
+    count = total_size = newest_mtime_ns = 0
+    for session_file in session_files:
+        try:
+            st = session_file.stat()
+        except OSError:
+            continue
+        count += 1
+        total_size += st.st_size
+        newest_mtime_ns = max(newest_mtime_ns, st.st_mtime_ns)
+    return (count, total_size, newest_mtime_ns, usernames)
+
+
+def _parse_project_cached(project: dict, anonymizer: Anonymizer, usernames: tuple[str, ...]) -> list[dict]:
+    key = (project["source"], project["dir_name"])
+    fingerprint = _project_fingerprint(project, usernames)
+    cached = _PARSE_CACHE.pop(key, None)
+    if cached is not None and cached[0] == fingerprint:
+        _PARSE_CACHE[key] = cached
+        return cached[1]
+
+    sessions = parse_project_sessions(
+        project["dir_name"],
+        anonymizer=anonymizer,
+        source=project["source"],
+    )
+    while len(_PARSE_CACHE) >= _PARSE_CACHE_MAX_PROJECTS:
+        del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+    _PARSE_CACHE[key] = (fingerprint, sessions)
+    return sessions
+
+
+def _copy_session(session: dict) -> dict:
+    """Copy *session* down to the message and tool-use dicts that callers rewrite.
+
+    Cached sessions are handed out on every call; the collector sets
+    ``project``, classification sets ``trajectory_type`` and redaction
+    rewrites message and tool-use fields in place.
+    """
+    session = dict(session)
+    messages = []
+    for msg in session.get("messages", []):
+        msg = dict(msg)
+        if "tool_uses" in msg:
+            msg["tool_uses"] = [dict(tool_use) for tool_use in msg["tool_uses"]]
+        messages.append(msg)
+    if "messages" in session:
+        session["messages"] = messages
+    return session
+
+
+def iter_new_sessions(
     config: CodeClawConfig,
     source_filter: str = "auto",
-) -> list[dict]:
-    """Collect sessions not yet synced, based on config tracking.
+) -> Iterator[dict]:
+    """Yield sessions not yet synced, based on config tracking.
 
-    Walks the Claude/Codex projects directory, parses JSONL logs, and returns
-    only sessions whose IDs are not in config['synced_session_ids'].
+    Walks the Claude/Codex projects directory, parses JSONL logs, and yields
+    only sessions whose IDs are not already synced (see
+    :func:`~codeclaw.config.get_synced_session_ids`). Parsed
+    projects are cached in-process until their session files change (each
+    call yields fresh copies, safe to modify), and projects after the one
+    currently being consumed are not parsed until the caller asks for more.
     """
-    synced_ids = set(config.get("synced_session_ids", []))
-    logs_dir = config.get("claude_logs_dir", "~/.claude/projects")
-    logs_path = Path(logs_dir).expanduser()
+    synced_ids = get_synced_session_ids(config)
 
     # Discover available projects
     projects = discover_projects()
@@ -31,30 +97,38 @@ def collect_new_sessions(
     if source_filter != "auto":
         projects = [p for p in projects if p["source"] == source_filter]
 
+    usernames = tuple(config.get("redact_usernames") or ())
     anonymizer = Anonymizer(
         extra_usernames=config.get("redact_usernames"),
     )
 
-    all_sessions = []
     for project in projects:
         # Skip excluded projects
         if project["dir_name"] in config.get("excluded_projects", []):
             continue
 
-        sessions = parse_project_sessions(
-            project["dir_name"],
-            anonymizer=anonymizer,
-            source=project["source"],
-        )
+        sessions = _parse_project_cached(project, anonymizer, usernames)
         for session in sessions:
             session_id = session.get("session_id", "")
             if session_id and session_id not in synced_ids:
+                session = _copy_session(session)
                 session["project"] = project.get("display_name", project["dir_name"])
-                all_sessions.append(session)
+                yield session
 
-    return all_sessions
+
+def collect_new_sessions(
+    config: CodeClawConfig,
+    source_filter: str = "auto",
+) -> list[dict]:
+    """Collect sessions not yet synced into a list (see :func:`iter_new_sessions`)."""
+    return list(iter_new_sessions(config, source_filter))
 
 
 def count_pending_sessions(config: CodeClawConfig) -> int:
     """Count how many sessions haven't been synced yet."""
-    return len(collect_new_sessions(config))
+    return sum(1 for _ in iter_new_sessions(config))
+
+
+def has_pending_sessions(config: CodeClawConfig) -> bool:
+    """Return True as soon as one unsynced session is found."""
+    return next(iter_new_sessions(config), None) is not None
@@ -3,12 +3,23 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
+import tempfile
 from pathlib import Path
 from typing import TypedDict
 
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:  # pragma: no cover — orjson optional
+    _json_loads = json.loads
+
 CONFIG_DIR = Path.home() / ".codeclaw"
 CONFIG_FILE = CONFIG_DIR / "config.json"
+SYNCED_IDS_FILENAME = "synced_ids.txt"
+
+# (path, mtime_ns, size) -> ids, so repeated loads skip re-reading an unchanged sidecar
+_SYNCED_IDS_CACHE: tuple[tuple[str, int, int], frozenset[str]] | None = None
 
 
 class CodeClawConfig(TypedDict, total=False):
@@ -64,22 +75,100 @@ DEFAULT_CONFIG: CodeClawConfig = {
 }
 
 
+def _write_if_changed(path: Path, text: str) -> None:
+    """Atomically replace *path* with *text* (chmod 600), skipping identical content."""
+    try:
+        if path.read_text(encoding="utf-8") == text:
+            path.chmod(0o600)  # tighten files left world-readable by older versions
+            return
+    except (OSError, UnicodeDecodeError):
+        pass
+    # A unique temp name (created 0600) so concurrent CLI and daemon saves
+    # never replace each other's half-written file.
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def _synced_ids_path() -> Path:
+    return CONFIG_DIR / SYNCED_IDS_FILENAME
+
+
+def load_synced_session_ids() -> frozenset[str]:
+    """Return synced session IDs from the newline-delimited sidecar file.
+
+    The parsed set is cached in-process and only re-read when the file changes.
+    """
+    global _SYNCED_IDS_CACHE
+    path = _synced_ids_path()
+    try:
+        st = path.stat()
+    except OSError:
+        return frozenset()
+    key = (str(path), st.st_mtime_ns, st.st_size)
+    if _SYNCED_IDS_CACHE is not None and _SYNCED_IDS_CACHE[0] == key:
+        return _SYNCED_IDS_CACHE[1]
+    try:
+        text = path.read_text(encoding="utf-8", errors="replace")
+    except OSError as exc:
+        print(f"Warning: could not read {path}: {exc}", file=sys.stderr)
+        return frozenset()
+    ids = frozenset(line for line in text.splitlines() if line)
+    _SYNCED_IDS_CACHE = (key, ids)
+    return ids
+
+
+def get_synced_session_ids(config: CodeClawConfig) -> frozenset[str]:
+    """Return every synced session ID: the sidecar plus any held in *config*.
+
+    *config* only carries IDs from a legacy config.json or ones added since
+    it was loaded, so the common case returns the cached sidecar set as-is.
+    """
+    synced = load_synced_session_ids()
+    inline = config.get("synced_session_ids")
+    return synced.union(inline) if inline else synced
+
+
+def _save_synced_session_ids(session_ids: list[str]) -> None:
+    # Synced IDs are only ever added, so merge into the sidecar's set
+    current = load_synced_session_ids()
+    ids = frozenset(str(sid) for sid in session_ids if sid)
+    if ids <= current:
+        return
+    ids |= current
+    _write_if_changed(_synced_ids_path(), "".join(f"{sid}\n" for sid in sorted(ids)))
+
+
 def load_config() -> CodeClawConfig:
+    config: CodeClawConfig = dict(DEFAULT_CONFIG)
     if CONFIG_FILE.exists():
         try:
             with open(CONFIG_FILE, encoding="utf-8", errors="replace") as f:
-                stored = json.load(f)
-            return {**DEFAULT_CONFIG, **stored}
+                stored = _json_loads(f.read())
+            config = {**DEFAULT_CONFIG, **stored}
         except (json.JSONDecodeError, OSError) as exc:
             print(f"Warning: could not read {CONFIG_FILE}: {exc}", file=sys.stderr)
-    return dict(DEFAULT_CONFIG)
+
+    # Synced IDs live in a sidecar (see get_synced_session_ids); any still held
+    # inline by an older config.json move there on the next save.
+    return config
 
 
 def save_config(config: CodeClawConfig) -> None:
     try:
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2)
-        CONFIG_FILE.chmod(0o600)
+        stored = dict(config)
+        synced = stored.pop("synced_session_ids", None)
+        if synced is not None:
+            _save_synced_session_ids(synced)
+        _write_if_changed(CONFIG_FILE, json.dumps(stored, indent=2))
     except OSError as exc:
         print(f"Warning: could not save {CONFIG_FILE}: {exc}", file=sys.stderr)
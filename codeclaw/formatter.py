@@ -6,6 +6,34 @@ from pathlib import Path
 
 # Pattern to match <thinking>...</thinking> blocks
 _THINKING_TAG_RE = re.compile(r"<thinking>.*?</thinking>", re.DOTALL)
+_THINKING_SUB = _THINKING_TAG_RE.sub
+
+# Shared encoders for JSONL output instead of a fresh one per json.dumps call.
+# Lines keep their unicode unless they hold lone surrogates from the logs,
+# which UTF-8 cannot encode; those lines are written with ASCII escapes.
+_JSONL_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_JSONL_ASCII_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+
+def _encode_line_json(obj) -> bytes:
+    try:
+        return (_JSONL_ENCODER.encode(obj) + "\n").encode("utf-8")
+    except UnicodeEncodeError:
+        return (_JSONL_ASCII_ENCODER.encode(obj) + "\n").encode("ascii")
+
+
+try:
+    import orjson  # type: ignore
+
+    def _encode_line(obj) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            # Lone surrogates or integers wider than 64 bits
+            return _encode_line_json(obj)
+
+except ImportError:  # pragma: no cover — orjson optional
+    _encode_line = _encode_line_json
 
 
 def format_session(session: dict) -> dict:
@@ -43,7 +71,9 @@ def format_session(session: dict) -> dict:
 
             # Remove <thinking>...</thinking> from content if present
             if content:
-                content = _THINKING_TAG_RE.sub("", content).strip()
+                if "<thinking>" in content:
+                    content = _THINKING_SUB("", content)
+                content = content.strip()
 
         if content:
             sft_messages.append({"role": role, "content": content})
@@ -81,10 +111,11 @@ def write_jsonl(sessions: list[dict], output_path: Path) -> int:
     Returns the number of sessions written.
     """
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    count = 0
-    with open(output_path, "w") as f:
-        for session in sessions:
-            formatted = format_session(session) if "metadata" not in session else session
-            f.write(json.dumps(formatted) + "\n")
-            count += 1
-    return count
+    # Encode every line first and hand the file a single buffer: one write
+    # instead of one per session.
+    lines = [
+        _encode_line(format_session(session) if "metadata" not in session else session)
+        for session in sessions
+    ]
+    output_path.write_bytes(b"".join(lines))
+    return len(lines)
@@ -1,7 +1,6 @@
 """Graph-structured tool-call indexing for the CodeClaw MCP server.
 
-Builds a lightweight in-memory directed graph (using networkx when available,
-falling back to a pure-Python adjacency dict otherwise) where:
+Builds a lightweight in-memory directed graph (interned adjacency dicts) where:
 
 - Nodes represent concepts: file names, error types, function names, tool names
 - Edges represent relationships: "co-occurs", "led_to_success", "caused_by", "was_fixed_by"
@@ -13,107 +12,107 @@ sessions given a set of current context nodes.
 
 from __future__ import annotations
 
+import functools
 import json
+import os
 import re
+import sys
 from collections import defaultdict
 from pathlib import Path
-from typing import Any
+from typing import IO
+
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:  # pragma: no cover — orjson optional
+    _json_loads = json.loads
 
 # ---------------------------------------------------------------------------
-# Graph abstraction — uses networkx if available, pure-Python dict otherwise
+# Graph storage — plain adjacency dicts; the index needs nothing from networkx
 # ---------------------------------------------------------------------------
 
-try:
-    import networkx as nx  # type: ignore
+class _Graph:
+    """Minimal directed graph with interned node and relation IDs.
 
-    def _make_graph():
-        return nx.DiGraph()
+    Node labels and relation names are mapped to ints once; each edge is
+    stored as ``out[src_id][dst_id] = (weight, rel_id)`` instead of a
+    per-edge attribute dict, which keeps large archives compact.
+    """
 
-    def _add_edge(graph, src: str, dst: str, **attrs) -> None:
-        if graph.has_edge(src, dst):
-            graph[src][dst]["weight"] = graph[src][dst].get("weight", 1) + 1
+    def __init__(self):
+        self._node_id: dict[str, int] = {}
+        self._id_node: list[str] = []
+        self._rel_id: dict[str | None, int] = {}
+        self._id_rel: list[str | None] = []
+        self._out: list[dict[int, tuple[int, int]]] = []
+        self._in: list[set[int]] = []
+
+    def _intern(self, node: str) -> int:
+        node_id = self._node_id.get(node)
+        if node_id is None:
+            node_id = self._node_id[node] = len(self._id_node)
+            self._id_node.append(node)
+            self._out.append({})
+            self._in.append(set())
+        return node_id
+
+    def _intern_rel(self, rel: str | None) -> int:
+        rel_id = self._rel_id.get(rel)
+        if rel_id is None:
+            rel_id = self._rel_id[rel] = len(self._id_rel)
+            self._id_rel.append(rel)
+        return rel_id
+
+    def add_edge(self, src: str, dst: str, weight: int = 1, rel: str | None = None) -> None:
+        src_id = self._intern(src)
+        dst_id = self._intern(dst)
+        out = self._out[src_id]
+        current = out.get(dst_id)
+        if current is None:
+            out[dst_id] = (weight, self._intern_rel(rel))
+            self._in[dst_id].add(src_id)
         else:
-            graph.add_edge(src, dst, weight=1, **attrs)
-
-    def _neighbors(graph, node: str) -> list[str]:
-        if node not in graph:
-            return []
-        return list(graph.successors(node)) + list(graph.predecessors(node))
-
-    def _has_node(graph, node: str) -> bool:
-        return node in graph
-
-    def _node_count(graph) -> int:
-        return graph.number_of_nodes()
-
-    def _edge_count(graph) -> int:
-        return graph.number_of_edges()
-
-    _NETWORKX_AVAILABLE = True
-
-except ImportError:  # pragma: no cover — networkx optional
-    class _PureGraph:
-        """Minimal directed graph backed by adjacency dicts."""
-
-        def __init__(self):
-            self._out: dict[str, dict[str, dict]] = defaultdict(dict)
-            self._in: dict[str, set] = defaultdict(set)
-
-        def add_edge(self, src: str, dst: str, **attrs) -> None:
-            if dst in self._out[src]:
-                self._out[src][dst]["weight"] = self._out[src][dst].get("weight", 1) + 1
-            else:
-                self._out[src][dst] = {"weight": 1, **attrs}
-            self._in[dst].add(src)
-            # ensure nodes exist
-            if src not in self._in:
-                self._in[src]  # noqa: B018
-            if dst not in self._out:
-                self._out[dst]  # noqa: B018
-
-        def has_edge(self, src: str, dst: str) -> bool:
-            return dst in self._out.get(src, {})
+            out[dst_id] = (current[0] + weight, current[1])
 
-        def successors(self, node: str):
-            return list(self._out.get(node, {}).keys())
+    def add_edges_bulk(self, edges_acc: dict[tuple[str, str], list]) -> None:
+        """Merge accumulated ``{(src, dst): [weight, rel]}`` edges into the graph."""
+        for (src, dst), (weight, rel) in edges_acc.items():
+            self.add_edge(src, dst, weight=weight, rel=rel)
 
-        def predecessors(self, node: str):
-            return list(self._in.get(node, set()))
-
-        def __contains__(self, node: str) -> bool:
-            return node in self._out or node in self._in
-
-        def number_of_nodes(self) -> int:
-            nodes = set(self._out.keys()) | set(self._in.keys())
-            return len(nodes)
-
-        def number_of_edges(self) -> int:
-            return sum(len(v) for v in self._out.values())
-
-        def __getitem__(self, src: str):
-            return self._out[src]
-
-    def _make_graph():
-        return _PureGraph()
+    def neighbors(self, node: str) -> list[str]:
+        """Return successors then predecessors of *node* (empty if unknown)."""
+        node_id = self._node_id.get(node)
+        if node_id is None:
+            return []
+        id_node = self._id_node
+        return [id_node[i] for i in self._out[node_id]] + [id_node[i] for i in self._in[node_id]]
 
-    def _add_edge(graph, src: str, dst: str, **attrs) -> None:
-        graph.add_edge(src, dst, **attrs)
+    def __contains__(self, node: str) -> bool:
+        return node in self._node_id
 
-    def _neighbors(graph, node: str) -> list[str]:
-        if node not in graph:
-            return []
-        return graph.successors(node) + graph.predecessors(node)
+    def number_of_nodes(self) -> int:
+        return len(self._id_node)
 
-    def _has_node(graph, node: str) -> bool:
-        return node in graph
+    def number_of_edges(self) -> int:
+        return sum(len(out) for out in self._out)
 
-    def _node_count(graph) -> int:
-        return graph.number_of_nodes()
+    def __getitem__(self, src: str):
+        """Return ``{dst: {"weight": ..., "rel": ...}}`` for *src* (a read-only copy)."""
+        return {
+            self._id_node[dst_id]: {"weight": weight, "rel": self._id_rel[rel_id]}
+            for dst_id, (weight, rel_id) in self._out[self._node_id[src]].items()
+        }
 
-    def _edge_count(graph) -> int:
-        return graph.number_of_edges()
 
-    _NETWORKX_AVAILABLE = False
+def _accumulate_edges(
+    edges_acc: dict[tuple[str, str], list], edges: list[tuple[str, str, str]]
+) -> None:
+    """Fold edge triples into ``{(src, dst): [weight, rel]}`` (first rel wins, as in _Graph.add_edge)."""
+    for src, dst, rel in edges:
+        entry = edges_acc.get((src, dst))
+        if entry is None:
+            edges_acc[(src, dst)] = [1, rel]
+        else:
+            entry[0] += 1
 
 
 # ---------------------------------------------------------------------------
@@ -124,22 +123,30 @@ _TOOL_NODE_PREFIX = "tool:"
 _FILE_NODE_PREFIX = "file:"
 _ERROR_NODE_PREFIX = "error:"
 
+# Node labels repeat heavily (tool names, files touched many times), so the
+# helpers below are memoized; the bounded LRU caps memory across rebuilds.
+# Labels are interned so a label recomputed after eviction is still the same
+# object as the graph and session-map keys, and lookups compare by identity.
 
+@functools.lru_cache(maxsize=4096)
 def _normalize_node(label: str) -> str:
     """Lowercase + strip whitespace for consistent node IDs."""
     return label.strip().lower()
 
 
+@functools.lru_cache(maxsize=4096)
 def _tool_node(name: str) -> str:
-    return _TOOL_NODE_PREFIX + _normalize_node(name)
+    return sys.intern(_TOOL_NODE_PREFIX + _normalize_node(name))
 
 
+@functools.lru_cache(maxsize=4096)
 def _file_node(name: str) -> str:
-    return _FILE_NODE_PREFIX + _normalize_node(name)
+    return sys.intern(_FILE_NODE_PREFIX + _normalize_node(name))
 
 
+@functools.lru_cache(maxsize=4096)
 def _error_node(msg: str) -> str:
-    return _ERROR_NODE_PREFIX + _normalize_node(msg[:60])
+    return sys.intern(_ERROR_NODE_PREFIX + _normalize_node(msg[:60]))
 
 
 _ERROR_RE = re.compile(r"(error|exception|traceback|failed)", re.IGNORECASE)
@@ -147,6 +154,8 @@ _FILE_RE = re.compile(r"[\w./\-]+\.\w{1,6}")
 
 
 def _extract_file_refs(text: str) -> list[str]:
+    if "." not in text:  # every match needs an extension
+        return []
     return [m for m in _FILE_RE.findall(text) if "/" in m or "." in m][:5]
 
 
@@ -158,27 +167,33 @@ def _extract_error_refs(text: str) -> list[str]:
     return hits[:3]
 
 
-def _index_session(graph: Any, session: dict) -> None:
-    """Add edges to *graph* from a single session."""
+def _extract_edges(session: dict) -> list[tuple[str, str, str]]:
+    """Return the ``(src, dst, rel)`` edge triples contributed by *session*.
+
+    Pure function of the session dict with no graph access, so the per-session
+    work can be batched, run in worker processes, or moved to a compiled
+    extension without touching the graph layer.
+    """
     messages = session.get("messages", [])
     is_successful = session.get("trajectory_type") not in ("correction_loop",)
 
+    edges: list[tuple[str, str, str]] = []
+    append = edges.append
     tool_seq: list[str] = []
     for msg in messages:
         role = msg.get("role")
         content = str(msg.get("content", ""))
 
         # Index file references from content
-        file_refs = _extract_file_refs(content)
-        for fref in file_refs:
+        for fref in _extract_file_refs(content):
             fnode = _file_node(fref)
-            _add_edge(graph, fnode, fnode, rel="self")  # ensure node exists
+            append((fnode, fnode, "self"))  # ensure node exists
 
         # Index errors from content
         if role == "user" or role == "tool_result":
             for err in _extract_error_refs(content):
                 enode = _error_node(err)
-                _add_edge(graph, enode, enode, rel="self")
+                append((enode, enode, "self"))
 
         # Tool uses
         for tu in msg.get("tool_uses", []):
@@ -191,13 +206,22 @@ def _index_session(graph: Any, session: dict) -> None:
             # file → tool edges
             tool_input = str(tu.get("input", ""))
             for fref in _extract_file_refs(tool_input):
-                fnode = _file_node(fref)
-                _add_edge(graph, fnode, tnode, rel="accessed_by")
+                append((_file_node(fref), tnode, "accessed_by"))
 
     # Sequential tool → tool edges
-    for i in range(len(tool_seq) - 1):
-        rel = "led_to_success" if is_successful else "co-occurs"
-        _add_edge(graph, tool_seq[i], tool_seq[i + 1], rel=rel)
+    rel = "led_to_success" if is_successful else "co-occurs"
+    for src, dst in zip(tool_seq, tool_seq[1:]):
+        append((src, dst, rel))
+    return edges
+
+
+def _index_session(graph: _Graph, session: dict) -> None:
+    """Add edges to *graph* from a single session."""
+    for src, dst, rel in _extract_edges(session):
+        graph.add_edge(src, dst, rel=rel)
+
+
+_NODE_SCORE_CACHE_SIZE = 1024
 
 
 class GraphIndex:
@@ -211,22 +235,40 @@ class GraphIndex:
     """
 
     def __init__(self) -> None:
-        self._graph = _make_graph()
-        # Map node → list of session_ids that contain this node
-        self._node_to_sessions: dict[str, list[str]] = defaultdict(list)
+        self._graph = _Graph()
+        # Map node → session_ids that contain this node (an insertion-ordered
+        # dict used as a set, so dedup is O(1) and query tie order is stable)
+        self._node_to_sessions: dict[str, dict[str, None]] = defaultdict(dict)
         self._sessions: dict[str, dict] = {}
+        # Per context node: {session_id: score contribution}. Reused across
+        # repeated queries and dropped whenever the index changes.
+        self._node_score_cache: dict[str, dict[str, int]] = {}
+        # stats() result until the next build()/add_session(); counting edges
+        # walks every node's adjacency.
+        self._stats_cache: dict | None = None
 
     def build(self, sessions: list[dict]) -> None:
         """Index all *sessions*, replacing any previously indexed data."""
-        self._graph = _make_graph()
-        self._node_to_sessions = defaultdict(list)
+        self._graph = _Graph()
+        self._node_to_sessions = defaultdict(dict)
         self._sessions = {}
+        # Count edges in a plain dict across all sessions, then touch the graph once
+        edges_acc: dict[tuple[str, str], list] = {}
         for session in sessions:
-            self.add_session(session)
+            _accumulate_edges(edges_acc, _extract_edges(session))
+            self._register_session(session)
+        self._graph.add_edges_bulk(edges_acc)
+        self._node_score_cache = {}
+        self._stats_cache = None
 
     def add_session(self, session: dict) -> None:
         """Incrementally add a single session to the index."""
         _index_session(self._graph, session)
+        self._register_session(session)
+        self._node_score_cache = {}
+        self._stats_cache = None
+
+    def _register_session(self, session: dict) -> None:
         session_id = str(session.get("session_id", id(session)))
         self._sessions[session_id] = session
 
@@ -235,9 +277,12 @@ class GraphIndex:
             for tu in msg.get("tool_uses", []):
                 tool_name = str(tu.get("tool", "")).strip()
                 if tool_name:
-                    tnode = _tool_node(tool_name)
-                    if session_id not in self._node_to_sessions[tnode]:
-                        self._node_to_sessions[tnode].append(session_id)
+                    self._node_to_sessions[_tool_node(tool_name)][session_id] = None
+
+    def has_node(self, node: str) -> bool:
+        """Return True if *node* could contribute to a :meth:`query` score."""
+        norm = _normalize_node(node)
+        return norm in self._node_to_sessions or norm in self._graph
 
     def query(self, context_nodes: list[str], max_results: int = 5) -> list[dict]:
         """Return up to *max_results* sessions structurally similar to *context_nodes*.
@@ -249,14 +294,8 @@ class GraphIndex:
 
         candidate_scores: dict[str, int] = defaultdict(int)
         for node in context_nodes:
-            norm = _normalize_node(node)
-            # Direct match
-            for sid in self._node_to_sessions.get(norm, []):
-                candidate_scores[sid] += 2
-            # Neighbor traversal
-            for neighbor in _neighbors(self._graph, norm):
-                for sid in self._node_to_sessions.get(neighbor, []):
-                    candidate_scores[sid] += 1
+            for sid, score in self._node_scores(_normalize_node(node)).items():
+                candidate_scores[sid] += score
 
         ranked = sorted(candidate_scores.items(), key=lambda x: -x[1])
         results = []
@@ -266,35 +305,109 @@ class GraphIndex:
                 results.append(session)
         return results
 
+    def _node_scores(self, norm: str) -> dict[str, int]:
+        """Return (cached) per-session score contributions for one context node."""
+        scores = self._node_score_cache.get(norm)
+        if scores is not None:
+            return scores
+
+        scores = defaultdict(int)
+        # Direct match
+        for sid in self._node_to_sessions.get(norm, ()):
+            scores[sid] += 2
+        # Neighbor traversal
+        for neighbor in self._graph.neighbors(norm):
+            for sid in self._node_to_sessions.get(neighbor, ()):
+                scores[sid] += 1
+
+        if len(self._node_score_cache) >= _NODE_SCORE_CACHE_SIZE:
+            self._node_score_cache.clear()
+        self._node_score_cache[norm] = scores = dict(scores)
+        return scores
+
     def stats(self) -> dict:
-        return {
-            "nodes": _node_count(self._graph),
-            "edges": _edge_count(self._graph),
-            "sessions": len(self._sessions),
-            "networkx_available": _NETWORKX_AVAILABLE,
-        }
+        if self._stats_cache is None:
+            self._stats_cache = {
+                "nodes": self._graph.number_of_nodes(),
+                "edges": self._graph.number_of_edges(),
+                "sessions": len(self._sessions),
+                # Kept for existing consumers of this payload; always False now
+                "networkx_available": False,
+            }
+        return dict(self._stats_cache)
 
 
 # ---------------------------------------------------------------------------
 # Convenience: build from JSONL files
 # ---------------------------------------------------------------------------
 
-def build_index_from_jsonl(paths: list[Path]) -> GraphIndex:
-    """Build a :class:`GraphIndex` from a list of JSONL file paths."""
-    index = GraphIndex()
-    for path in paths:
-        if not path.exists():
+# Files below this size are read in one go and split in memory; larger ones stream
+_READ_WHOLE_FILE_LIMIT = 64 << 20
+
+
+def _is_file_object(source: str | os.PathLike | IO) -> bool:
+    return hasattr(source, "read")
+
+
+def _iter_jsonl_lines(path: str | os.PathLike | IO):
+    """Yield raw lines from *path*, reading small files in a single call.
+
+    An already-open file object is iterated as-is (its lines may be str).
+    """
+    if _is_file_object(path):
+        yield from path
+        return
+    path = Path(path)
+    if path.stat().st_size < _READ_WHOLE_FILE_LIMIT:
+        yield from path.read_bytes().splitlines()
+        return
+    with open(path, "rb") as f:
+        yield from f
+
+
+def _load_jsonl_sessions(path: str | os.PathLike | IO) -> list[dict]:
+    sessions: list[dict] = []
+    for line in _iter_jsonl_lines(path):
+        # Raw bytes go straight to the parser; whitespace-only lines fail to
+        # decode and are skipped along with malformed ones.
+        if not line:
+            continue
+        try:
+            sessions.append(_json_loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
             continue
-        with open(path, encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    session = json.loads(line)
-                    index.add_session(session)
-                except json.JSONDecodeError:
-                    continue
+    return sessions
+
+
+def _parse_file_to_edges(path: str | os.PathLike | IO) -> tuple[list[dict], list[tuple[str, str, str]]]:
+    """Parse one JSONL file into its sessions and their edge triples."""
+    sessions = _load_jsonl_sessions(path)
+    edges: list[tuple[str, str, str]] = []
+    for session in sessions:
+        edges.extend(_extract_edges(session))
+    return sessions, edges
+
+
+def build_index_from_jsonl(paths: list[str | os.PathLike | IO]) -> GraphIndex:
+    """Build a :class:`GraphIndex` from a list of JSONL file paths.
+
+    Open file objects (anything with ``.read``, e.g. ``io.StringIO``) are
+    accepted alongside ``str`` and path-like paths. Each source is parsed
+    into sessions and edge triples, which are then merged in *paths* order.
+    """
+    parsed = [
+        _parse_file_to_edges(path)
+        for path in paths
+        if _is_file_object(path) or Path(path).exists()
+    ]
+
+    index = GraphIndex()
+    edges_acc: dict[tuple[str, str], list] = {}
+    for sessions, edges in parsed:
+        _accumulate_edges(edges_acc, edges)
+        for session in sessions:
+            index._register_session(session)
+    index._graph.add_edges_bulk(edges_acc)
     return index
 
 
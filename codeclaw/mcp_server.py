@@ -15,10 +15,19 @@ Tools:
 from __future__ import annotations
 
 import json
+import re
 import sys
+import threading
 import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Callable
+from typing import Any, Callable, NamedTuple
+
+from .anonymizer import Anonymizer
+from .classifier import classify_trajectory
+from .graph_index import GraphIndex
+from .parser import discover_projects, parse_project_sessions
 
 try:
     from mcp.server.fastmcp import FastMCP
@@ -38,25 +47,62 @@ def _get_mcp_or_exit():
     return FastMCP
 
 
+# Tool payloads are read by the client, not people, so they are sent compact
+# and keep their unicode. Lone surrogates from the logs cannot be written as
+# UTF-8, so a payload holding one is escaped instead, as json.dumps did.
+_PAYLOAD_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_ASCII_PAYLOAD_ENCODER = json.JSONEncoder(separators=(",", ":"))
+_SURROGATE_RE = re.compile("[\ud800-\udfff]")
+
+
+def _dumps_json(obj: Any) -> str:
+    payload = _PAYLOAD_ENCODER.encode(obj)
+    if _SURROGATE_RE.search(payload):
+        return _ASCII_PAYLOAD_ENCODER.encode(obj)
+    return payload
+
+
+try:
+    import orjson  # type: ignore
+
+    _json_loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            # Lone surrogates or integers wider than 64 bits
+            return _dumps_json(obj)
+
+except ImportError:  # pragma: no cover — orjson optional
+    _json_loads = json.loads
+    _dumps = _dumps_json
+
+
 def _ok_payload(results: Any, **meta: Any) -> str:
-    return json.dumps({"ok": True, "results": results, "meta": meta}, indent=2)
+    return _dumps({"ok": True, "results": results, "meta": meta})
 
 
 def _error_payload(code: str, message: str, **meta: Any) -> str:
-    return json.dumps(
-        {"ok": False, "error": {"code": code, "message": message}, "meta": meta},
-        indent=2,
-    )
+    return _dumps({"ok": False, "error": {"code": code, "message": message}, "meta": meta})
+
 
+def _flat_tool_names(session: dict[str, Any]) -> list[str]:
+    """Names of every tool used in *session*, in call order."""
+    return [
+        tool_name
+        for message in session.get("messages", [])
+        for tool_use in message.get("tool_uses", [])
+        if (tool_name := str(tool_use.get("tool", "")).strip())
+    ]
 
-def _session_summary(session: dict[str, Any], rank: int | None = None) -> dict[str, Any]:
-    tool_uses: list[str] = []
-    for message in session.get("messages", []):
-        for tool_use in message.get("tool_uses", []):
-            tool_name = str(tool_use.get("tool", "")).strip()
-            if tool_name:
-                tool_uses.append(tool_name)
 
+def _session_summary(
+    session: dict[str, Any],
+    rank: int | None = None,
+    tool_names: list[str] | None = None,
+) -> dict[str, Any]:
+    tool_uses = _flat_tool_names(session) if tool_names is None else tool_names
     summary: dict[str, Any] = {
         "session_id": session.get("session_id"),
         "project": session.get("project"),
@@ -71,26 +117,29 @@ def _session_summary(session: dict[str, Any], rank: int | None = None) -> dict[s
     return summary
 
 
+# One comma-separated context token, with surrounding whitespace trimmed. The
+# prefix/value groups are set only when the token contains a ":".
+_CONTEXT_TOKEN_RE = re.compile(
+    r"\s*(?P<token>(?P<prefix>[^,:]*):(?P<value>[^,]*?)|[^,]*?)\s*(?:,|\Z)"
+)
+_CONTEXT_PREFIXES = frozenset({"tool", "file", "error"})
+
+
 def _parse_context_nodes(context: str) -> tuple[list[str], list[str]]:
     nodes: list[str] = []
     invalid_tokens: list[str] = []
     seen: set[str] = set()
-    allowed_prefixes = {"tool", "file", "error"}
 
-    for raw in context.split(","):
-        token = raw.strip()
+    for match in _CONTEXT_TOKEN_RE.finditer(context):
+        token = match.group("token")
         if not token:
             continue
-        lowered = token.lower()
-        if ":" not in lowered:
-            invalid_tokens.append(token)
-            continue
-        prefix, value = lowered.split(":", 1)
-        value = value.strip()
-        if prefix not in allowed_prefixes or not value:
+        prefix = (match.group("prefix") or "").lower()
+        value = (match.group("value") or "").lstrip()
+        if prefix not in _CONTEXT_PREFIXES or not value:
             invalid_tokens.append(token)
             continue
-        normalized = f"{prefix}:{value}"
+        normalized = f"{prefix}:{value.lower()}"
         if normalized in seen:
             continue
         seen.add(normalized)
@@ -99,8 +148,167 @@ def _parse_context_nodes(context: str) -> tuple[list[str], list[str]]:
     return nodes, invalid_tokens
 
 
+# Project parsing is dominated by file reads, so a few threads overlap the I/O.
+_REFRESH_MAX_WORKERS = 8
+
+_TOKEN_RE = re.compile(r"\w+")
+# Too common to narrow a search; left out of the term index to keep it small.
+_STOPWORDS = frozenset({
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has",
+    "have", "i", "if", "in", "is", "it", "its", "me", "my", "no", "not", "of", "on",
+    "or", "so", "that", "the", "this", "to", "was", "we", "with", "you",
+})
+
+
+# Joins per-message content in the search blob. Queries are typed text, so a
+# NUL never appears in one and a match can't straddle two messages.
+_MESSAGE_SEPARATOR = "\x00"
+
+
+def _content_blob(session: dict[str, Any]) -> str:
+    """Lowercased content of every message in *session*, one string per session."""
+    return _MESSAGE_SEPARATOR.join(
+        str(message.get("content", "")).lower() for message in session.get("messages", [])
+    )
+
+
+def _encode_for_search(text: str) -> bytes:
+    # UTF-8 is self-synchronizing, so byte substring matches are exactly the
+    # str matches; surrogatepass keeps lone surrogates from the logs lossless.
+    return text.encode("utf-8", "surrogatepass")
+
+
+def _build_term_index(blobs: list[str]) -> dict[str, set[int]]:
+    """Map each content token to the positions of the session blobs containing it."""
+    term_index: dict[str, set[int]] = defaultdict(set)
+    for position, blob in enumerate(blobs):
+        for term in set(_TOKEN_RE.findall(blob)) - _STOPWORDS:
+            term_index[sys.intern(term)].add(position)
+    return dict(term_index)
+
+
+def _build_project_patterns(
+    sessions: list[dict[str, Any]],
+    flat_tools: list[list[str]] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Count sessions and tool uses per project, in first-seen order."""
+    if flat_tools is None:
+        flat_tools = [_flat_tool_names(session) for session in sessions]
+    per_project: dict[str, dict[str, Any]] = {}
+    for session, tool_names in zip(sessions, flat_tools):
+        project_name = str(session.get("project") or "unknown")
+        stats = per_project.setdefault(
+            project_name,
+            {"session_count": 0, "tool_counts": Counter()},
+        )
+        stats["session_count"] += 1
+        stats["tool_counts"].update(tool_names)
+    for stats in per_project.values():
+        stats["tool_counts"] = dict(stats["tool_counts"])
+    return per_project
+
+
+def _build_trigram_index(terms: Any) -> dict[str, list[str]]:
+    """Map each 3-character substring to the indexed terms containing it."""
+    trigram_index: dict[str, list[str]] = defaultdict(list)
+    for term in terms:
+        for trigram in {term[i:i + 3] for i in range(len(term) - 2)}:
+            trigram_index[trigram].append(term)
+    return dict(trigram_index)
+
+
+def _terms_containing(
+    token: str,
+    term_index: dict[str, set[int]],
+    trigram_index: dict[str, list[str]],
+) -> list[str]:
+    """Indexed terms that contain *token* as a substring."""
+    if len(token) < 3:
+        return [term for term in term_index if token in term]
+    # Every matching term carries each of the token's trigrams, so the rarest
+    # trigram's term list is a complete candidate set.
+    shortest: list[str] | None = None
+    for i in range(len(token) - 2):
+        terms = trigram_index.get(token[i:i + 3])
+        if terms is None:
+            return []
+        if shortest is None or len(terms) < len(shortest):
+            shortest = terms
+    return [term for term in shortest or () if token in term]
+
+
+def _content_candidates(
+    term_index: dict[str, set[int]],
+    trigram_index: dict[str, list[str]],
+    needle: str,
+) -> set[int] | None:
+    """Positions of sessions that may contain *needle*, or None if it can't be narrowed.
+
+    A needle token can be a fragment of a longer word at either end of the
+    needle, so each token matches every indexed term that contains it.
+    """
+    postings: list[set[int]] = []
+    for token in set(_TOKEN_RE.findall(needle)):
+        if any(token in stopword for stopword in _STOPWORDS):
+            continue  # could occur only inside an unindexed stopword
+        posting: set[int] = set()
+        for term in _terms_containing(token, term_index, trigram_index):
+            posting |= term_index[term]
+        if not posting:
+            return set()
+        postings.append(posting)
+
+    if not postings:
+        return None
+    postings.sort(key=len)
+    result = set(postings[0])
+    for posting in postings[1:]:
+        result &= posting
+    return result
+
+
+def _index_stats(index: Any) -> dict[str, Any]:
+    if not hasattr(index, "stats"):
+        return {}
+    try:
+        stats = index.stats()
+    except Exception:
+        return {}
+    return stats if isinstance(stats, dict) else {}
+
+
+class _Snapshot(NamedTuple):
+    """Everything one refresh produced, published to readers as a single object."""
+
+    sessions: list[dict[str, Any]]
+    index: Any
+    meta: dict[str, Any]
+    content_blobs: list[bytes]
+    term_index: dict[str, set[int]]
+    trigram_index: dict[str, list[str]]
+    project_index: dict[str, set[int]]
+    session_by_id: dict[str, dict[str, Any]]
+    summaries: dict[int, dict[str, Any]]
+    project_patterns: dict[str, dict[str, Any]]
+
+
 class SessionIndexService:
-    """Load sessions once, build a graph index, and serve cached access."""
+    """Load sessions once, build a graph index, and serve cached access.
+
+    Each refresh builds a new :class:`_Snapshot` and swaps it in with one
+    attribute assignment, so readers never lock and never see a half-built
+    state. Only refreshes are serialized.
+    """
+
+    __slots__ = (
+        "_discover_projects",
+        "_parse_project_sessions",
+        "_anonymizer",
+        "_graph_index_factory",
+        "_refresh_lock",
+        "_snapshot",
+        "_trajectory_counts",
+    )
 
     def __init__(
         self,
@@ -110,84 +318,194 @@ class SessionIndexService:
         graph_index_factory: Callable[[], Any] | None = None,
     ) -> None:
         if discover_projects_fn is None or parse_project_sessions_fn is None:
-            from .parser import discover_projects, parse_project_sessions
-
             discover_projects_fn = discover_projects
             parse_project_sessions_fn = parse_project_sessions
-        if anonymizer_factory is None:
-            from .anonymizer import Anonymizer
-
-            anonymizer_factory = Anonymizer
-        if graph_index_factory is None:
-            from .graph_index import GraphIndex
-
-            graph_index_factory = GraphIndex
 
         self._discover_projects = discover_projects_fn
         self._parse_project_sessions = parse_project_sessions_fn
-        self._anonymizer_factory = anonymizer_factory
-        self._graph_index_factory = graph_index_factory
-
-        self._sessions: list[dict[str, Any]] | None = None
-        self._index: Any | None = None
-        self._project_count = 0
-        self._refresh_count = 0
-        self._last_refresh_ms = 0.0
-
-    def _ensure_loaded(self) -> None:
-        if self._sessions is None or self._index is None:
-            self.refresh()
+        # Anonymizer state is fixed at construction, so one instance is shared
+        # by every refresh and every parsing thread.
+        self._anonymizer = (anonymizer_factory or Anonymizer)([])
+        self._graph_index_factory = graph_index_factory or GraphIndex
+
+        self._refresh_lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+        # (snapshot, classify_fn, counts) for the last trajectory_counts() call.
+        self._trajectory_counts: tuple[_Snapshot, Callable[..., str], dict[str, int]] | None = None
+
+    def _current(self) -> _Snapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._refresh_lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._rebuild()
+        return snapshot
 
     def refresh(self) -> dict[str, Any]:
+        with self._refresh_lock:
+            snapshot = self._rebuild()
+        return self._meta(snapshot)
+
+    def _rebuild(self) -> _Snapshot:
+        """Build and publish a new snapshot. Caller holds ``_refresh_lock``."""
         start = time.perf_counter()
-        anonymizer = self._anonymizer_factory([])
         projects = self._discover_projects()
         sessions: list[dict[str, Any]] = []
-        for project in projects:
-            sessions.extend(
-                self._parse_project_sessions(
-                    project.get("dir_name", ""),
-                    anonymizer=anonymizer,
-                    include_thinking=False,
-                    source=project.get("source", "claude"),
-                )
-            )
+        for project_sessions in self._parse_projects(projects):
+            sessions.extend(project_sessions)
 
         index = self._graph_index_factory()
         index.build(sessions)
 
-        self._sessions = sessions
-        self._index = index
-        self._project_count = len(projects)
-        self._refresh_count += 1
-        self._last_refresh_ms = round((time.perf_counter() - start) * 1000, 2)
-        return self.meta()
+        project_index: dict[str, set[int]] = defaultdict(set)
+        session_by_id: dict[str, dict[str, Any]] = {}
+        for position, session in enumerate(sessions):
+            project_index[str(session.get("project", "")).lower()].add(position)
+            # First occurrence wins, matching the order sessions are listed in.
+            session_by_id.setdefault(str(session.get("session_id")), session)
+
+        blobs = [_content_blob(session) for session in sessions]
+        term_index = _build_term_index(blobs)
+        trigram_index = _build_trigram_index(term_index)
+        # Kept as UTF-8: one non-Latin-1 character would otherwise make the
+        # whole str 4 bytes per character, and bytes search is no slower.
+        content_blobs = [_encode_for_search(blob) for blob in blobs]
+
+        # Walk every message's tool_uses once; summaries and project patterns share it.
+        flat_tools = [_flat_tool_names(session) for session in sessions]
+        # Keyed by object identity: the snapshot keeps its sessions alive,
+        # and session_id is not guaranteed unique across sources.
+        summaries = {
+            id(session): _session_summary(session, tool_names=tool_names)
+            for session, tool_names in zip(sessions, flat_tools)
+        }
+        project_patterns = _build_project_patterns(sessions, flat_tools)
+
+        index_stats = _index_stats(index)
+
+        # Timed after every structure is built, so the metric covers the whole refresh
+        previous = self._snapshot
+        meta = {
+            "session_count": len(sessions),
+            "project_count": len(projects),
+            "refresh_count": (previous.meta["refresh_count"] if previous else 0) + 1,
+            "last_refresh_ms": round((time.perf_counter() - start) * 1000, 2),
+            "index_stats": index_stats,
+        }
+        snapshot = _Snapshot(
+            sessions=sessions,
+            index=index,
+            meta=meta,
+            content_blobs=content_blobs,
+            term_index=term_index,
+            trigram_index=trigram_index,
+            project_index=dict(project_index),
+            session_by_id=session_by_id,
+            summaries=summaries,
+            project_patterns=project_patterns,
+        )
+        self._snapshot = snapshot
+        return snapshot
+
+    def _parse_projects(self, projects: list[dict[str, Any]]) -> list[list[dict[str, Any]]]:
+        """Parse each project's sessions, in project order, on a small thread pool."""
+        anonymizer = self._anonymizer
+
+        def parse(project: dict[str, Any]) -> list[dict[str, Any]]:
+            return self._parse_project_sessions(
+                project.get("dir_name", ""),
+                anonymizer=anonymizer,
+                include_thinking=False,
+                source=project.get("source", "claude"),
+            )
+
+        workers = min(_REFRESH_MAX_WORKERS, len(projects))
+        if workers <= 1:
+            return [parse(project) for project in projects]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parse, projects))
 
     def sessions(self) -> list[dict[str, Any]]:
-        self._ensure_loaded()
-        return self._sessions or []
+        return self._current().sessions
 
     def index(self) -> Any:
-        self._ensure_loaded()
-        return self._index
+        return self._current().index
+
+    def get(self, session_id: str) -> dict[str, Any] | None:
+        """Return the cached session with *session_id*, or None."""
+        return self._current().session_by_id.get(session_id)
+
+    def project_patterns(self) -> dict[str, dict[str, Any]]:
+        """Per-project session and tool-use counts, computed once per refresh."""
+        return self._current().project_patterns
+
+    def trajectory_counts(self, classify_fn: Callable[[dict[str, Any]], str]) -> dict[str, int]:
+        """Count sessions per *classify_fn* label, cached until the next refresh."""
+        snapshot = self._current()
+        cached = self._trajectory_counts
+        if cached is None or cached[0] is not snapshot or cached[1] is not classify_fn:
+            counts = Counter(classify_fn(session) for session in snapshot.sessions)
+            cached = self._trajectory_counts = (snapshot, classify_fn, dict(counts))
+        return cached[2]
+
+    def summary(self, session: dict[str, Any], rank: int | None = None) -> dict[str, Any]:
+        """Return the summary for *session*, built once per refresh."""
+        snapshot = self._snapshot
+        cached = snapshot.summaries.get(id(session)) if snapshot is not None else None
+        if cached is None:
+            return _session_summary(session, rank=rank)
+        summary = dict(cached)
+        if rank is not None:
+            summary["rank"] = rank
+        return summary
+
+    def search(self, needle: str, max_results: int) -> list[dict[str, Any]]:
+        """Return up to *max_results* sessions whose content or project contains *needle*.
+
+        *needle* must already be lowercased. Matching is plain substring
+        matching; the term index only narrows which sessions get checked.
+        """
+        snapshot = self._current()
+        sessions = snapshot.sessions
+
+        project_hits: set[int] = set()
+        for project_name, positions in snapshot.project_index.items():
+            if needle in project_name:
+                project_hits |= positions
+
+        candidates = _content_candidates(snapshot.term_index, snapshot.trigram_index, needle)
+        if candidates is None:
+            ordered: Any = range(len(sessions))
+        else:
+            ordered = sorted(candidates | project_hits)
+
+        blobs = snapshot.content_blobs
+        needle_bytes = _encode_for_search(needle)
+        matches: list[dict[str, Any]] = []
+        for position in ordered:
+            if position not in project_hits and needle_bytes not in blobs[position]:
+                continue
+            matches.append(sessions[position])
+            if len(matches) >= max_results:
+                break
+        return matches
 
     def meta(self) -> dict[str, Any]:
-        index_stats: dict[str, Any] = {}
-        if self._index is not None and hasattr(self._index, "stats"):
-            try:
-                maybe_stats = self._index.stats()
-                if isinstance(maybe_stats, dict):
-                    index_stats = maybe_stats
-            except Exception:
-                index_stats = {}
-
-        return {
-            "session_count": len(self._sessions or []),
-            "project_count": self._project_count,
-            "refresh_count": self._refresh_count,
-            "last_refresh_ms": self._last_refresh_ms,
-            "index_stats": index_stats,
-        }
+        return self._meta(self._snapshot)
+
+    @staticmethod
+    def _meta(snapshot: _Snapshot | None) -> dict[str, Any]:
+        if snapshot is None:
+            return {
+                "session_count": 0,
+                "project_count": 0,
+                "refresh_count": 0,
+                "last_refresh_ms": 0.0,
+                "index_stats": {},
+            }
+        # Built once per refresh; a shallow copy keeps callers off the shared dict.
+        return dict(snapshot.meta)
 
 
 def create_mcp_server(
@@ -197,7 +515,7 @@ def create_mcp_server(
     """Create and return the FastMCP server instance with memory tools."""
     FastMCP = _get_mcp_or_exit()
     if classify_fn is None:
-        from .classifier import classify_trajectory as classify_fn
+        classify_fn = classify_trajectory
 
     service = session_service or SessionIndexService()
     mcp = FastMCP("codeclaw")
@@ -227,17 +545,10 @@ def create_mcp_server(
                 **service.meta(),
             )
 
-        summaries: list[dict[str, Any]] = []
-        for session in service.sessions():
-            content_match = any(
-                needle in str(message.get("content", "")).lower()
-                for message in session.get("messages", [])
-            )
-            if not content_match and needle not in str(session.get("project", "")).lower():
-                continue
-            summaries.append(_session_summary(session, rank=len(summaries) + 1))
-            if len(summaries) >= max_results:
-                break
+        summaries = [
+            service.summary(session, rank=i + 1)
+            for i, session in enumerate(service.search(needle, max_results))
+        ]
 
         return _ok_payload(
             summaries,
@@ -272,8 +583,14 @@ def create_mcp_server(
                 **service.meta(),
             )
 
-        sessions = service.index().query(nodes, max_results=max_results)
-        results = [_session_summary(session, rank=i + 1) for i, session in enumerate(sessions)]
+        index = service.index()
+        # Injected indexes may not implement has_node; then always query
+        has_node = getattr(index, "has_node", None)
+        if has_node is None or any(has_node(node) for node in nodes):
+            sessions = index.query(nodes, max_results=max_results)
+        else:
+            sessions = []  # nothing in the index can score against these nodes
+        results = [service.summary(session, rank=i + 1) for i, session in enumerate(sessions)]
         return _ok_payload(
             results,
             context_nodes=nodes,
@@ -298,22 +615,12 @@ def create_mcp_server(
                     **service.meta(),
                 )
 
-        per_project: dict[str, dict[str, Any]] = {}
-        for session in service.sessions():
-            project_name = str(session.get("project") or "unknown")
-            if project_filter and project_name != project_filter:
-                continue
-            stats = per_project.setdefault(
-                project_name,
-                {"session_count": 0, "tool_counts": {}},
-            )
-            stats["session_count"] += 1
-            for message in session.get("messages", []):
-                for tool_use in message.get("tool_uses", []):
-                    tool_name = str(tool_use.get("tool", "")).strip()
-                    if not tool_name:
-                        continue
-                    stats["tool_counts"][tool_name] = stats["tool_counts"].get(tool_name, 0) + 1
+        patterns = service.project_patterns()
+        if project_filter is None:
+            per_project = patterns
+        else:
+            stats = patterns.get(project_filter)
+            per_project = {project_filter: stats} if stats is not None else {}
 
         return _ok_payload(
             per_project,
@@ -325,10 +632,7 @@ def create_mcp_server(
     @mcp.tool()
     def get_trajectory_stats() -> str:
         """Return trajectory classification counts for cached sessions."""
-        counts: dict[str, int] = {}
-        for session in service.sessions():
-            label = classify_fn(session)
-            counts[label] = counts.get(label, 0) + 1
+        counts = service.trajectory_counts(classify_fn)
         return _ok_payload(
             counts,
             unique_trajectories=len(counts),
@@ -347,9 +651,9 @@ def create_mcp_server(
                 **service.meta(),
             )
 
-        for session in service.sessions():
-            if str(session.get("session_id")) == lookup:
-                return _ok_payload(session, session_id=lookup, **service.meta())
+        session = service.get(lookup)
+        if session is not None:
+            return _ok_payload(session, session_id=lookup, **service.meta())
         return _error_payload(
             "session_not_found",
             "Session ID was not found in the local cache.",
@@ -366,10 +670,10 @@ def serve() -> None:
     mcp.run(transport="stdio")
 
 
-def _backup_corrupt_mcp_config(path: Path, content: str) -> Path | None:
+def _backup_corrupt_mcp_config(path: Path, content: bytes) -> Path | None:
     backup_path = path.with_name(path.name + ".corrupt.bak")
     try:
-        backup_path.write_text(content, encoding="utf-8")
+        backup_path.write_bytes(content)
         return backup_path
     except OSError:
         return None
@@ -384,15 +688,16 @@ def install_mcp() -> None:
     backup_path: Path | None = None
     if mcp_config_path.exists():
         try:
-            raw_text = mcp_config_path.read_text(encoding="utf-8")
+            raw_bytes = mcp_config_path.read_bytes()
         except OSError as exc:
             print(f"Error reading {mcp_config_path}: {exc}", file=sys.stderr)
             sys.exit(1)
 
         try:
-            parsed = json.loads(raw_text)
-        except json.JSONDecodeError:
-            backup_path = _backup_corrupt_mcp_config(mcp_config_path, raw_text)
+            # Both parsers take bytes directly; ValueError also covers invalid UTF-8.
+            parsed = _json_loads(raw_bytes)
+        except ValueError:
+            backup_path = _backup_corrupt_mcp_config(mcp_config_path, raw_bytes)
             print(
                 (
                     f"Warning: {mcp_config_path} contained invalid JSON; "
@@ -405,7 +710,7 @@ def install_mcp() -> None:
         if isinstance(parsed, dict):
             existing = parsed
         else:
-            backup_path = _backup_corrupt_mcp_config(mcp_config_path, raw_text)
+            backup_path = _backup_corrupt_mcp_config(mcp_config_path, raw_bytes)
             print(
                 (
                     f"Warning: {mcp_config_path} root value is not a JSON object; "
@@ -424,13 +729,18 @@ def install_mcp() -> None:
         mcp_servers = {}
         existing["mcpServers"] = mcp_servers
 
-    mcp_servers["codeclaw"] = {
+    entry = {
         "command": sys.executable,
         "args": ["-m", "codeclaw.mcp_server", "--serve"],
     }
 
-    mcp_config_path.write_text(json.dumps(existing, indent=2), encoding="utf-8")
-    print(f"MCP server registered in {mcp_config_path}")
+    if mcp_servers.get("codeclaw") == entry:
+        # Already registered: leave the user's file (and its formatting) alone.
+        print(f"MCP server already registered in {mcp_config_path}")
+    else:
+        mcp_servers["codeclaw"] = entry
+        mcp_config_path.write_text(json.dumps(existing, indent=2), encoding="utf-8")
+        print(f"MCP server registered in {mcp_config_path}")
     print(
         json.dumps(
             {
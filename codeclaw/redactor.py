@@ -1,5 +1,8 @@
 """Sensitive info removal for CodeClaw — wraps secrets and anonymizer modules."""
 
+import functools
+
+from ._pool import pool_map
 from .anonymizer import Anonymizer
 from .secrets import redact_custom_strings, redact_session, redact_text, scan_text
 
@@ -13,19 +16,43 @@ __all__ = [
 ]
 
 
+# Below this many sessions, starting worker processes costs more than it saves.
+_PARALLEL_MIN_SESSIONS = 256
+
+
 def redact_all_sessions(
     sessions: list[dict],
     custom_strings: list[str] | None = None,
+    max_workers: int | None = None,
 ) -> tuple[list[dict], int]:
     """Redact secrets from a list of sessions.
 
+    Sessions are redacted in-process unless *max_workers* > 1 is passed for a
+    large batch, which then uses a capped, non-forking process pool. Either
+    way the input session dicts are updated in place and returned in their
+    original order.
+
     Returns:
         Tuple of (redacted sessions, total redaction count).
     """
+    results: list[tuple[dict, int]] | None = None
+    if len(sessions) >= _PARALLEL_MIN_SESSIONS:
+        results = pool_map(
+            functools.partial(redact_session, custom_strings=custom_strings),
+            sessions,
+            max_workers,
+            chunksize=32,
+        )
+    if results is None:
+        results = [redact_session(session, custom_strings) for session in sessions]
+
     total_redactions = 0
     redacted = []
-    for session in sessions:
-        session, count = redact_session(session, custom_strings)
+    for session, (result, count) in zip(sessions, results):
+        if result is not session:
+            # Worker results are pickled copies; write them back in full.
+            session.clear()
+            session.update(result)
         total_redactions += count
         redacted.append(session)
     return redacted, total_redactions
@@ -2,6 +2,7 @@
 
 import math
 import re
+from functools import lru_cache
 
 REDACTED = "[REDACTED]"
 
@@ -209,17 +210,25 @@ def redact_text(text: str) -> tuple[str, int]:
     return result, len(deduped)
 
 
+@lru_cache(maxsize=64)
+def _custom_string_patterns(strings: tuple[str, ...]) -> tuple[re.Pattern, ...]:
+    """Compile the patterns for *strings* once per distinct list, in order."""
+    patterns = []
+    for target in strings:
+        if not target or len(target) < 3:
+            continue
+        escaped = re.escape(target)
+        patterns.append(re.compile(rf"\b{escaped}\b" if len(target) >= 4 else escaped))
+    return tuple(patterns)
+
+
 def redact_custom_strings(text: str, strings: list[str]) -> tuple[str, int]:
     if not text or not strings:
         return text, 0
 
     count = 0
-    for target in strings:
-        if not target or len(target) < 3:
-            continue
-        escaped = re.escape(target)
-        pattern = rf"\b{escaped}\b" if len(target) >= 4 else escaped
-        text, replacements = re.subn(pattern, REDACTED, text)
+    for pattern in _custom_string_patterns(tuple(strings)):
+        text, replacements = pattern.subn(REDACTED, text)
         count += replacements
 
     return text, count
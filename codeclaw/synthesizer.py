@@ -6,8 +6,14 @@ import json
 import re
 from collections import Counter, defaultdict
 from datetime import datetime, timezone
+from itertools import chain
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads  # type: ignore
+except ImportError:  # pragma: no cover — orjson optional
+    _json_loads = json.loads
+
 CODECLAW_MD_HEADER = "<!-- AUTO-GENERATED by CodeClaw. Do not edit manually. -->"
 MAX_LINES = 200
 
@@ -16,15 +22,14 @@ def _load_sessions_from_jsonl(path: Path) -> list[dict]:
     sessions: list[dict] = []
     if not path.exists():
         return sessions
-    with open(path, encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            try:
-                sessions.append(json.loads(line))
-            except json.JSONDecodeError:
-                continue
+    # Raw byte lines go straight to the parser (orjson skips the str decode)
+    for line in path.read_bytes().splitlines():
+        if not line.strip():
+            continue
+        try:
+            sessions.append(_json_loads(line))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            continue
     return sessions
 
 
@@ -43,23 +48,26 @@ def _extract_tool_sequences(sessions: list[dict]) -> list[list[str]]:
     return sequences
 
 
+_ERROR_LINE_RE = re.compile(
+    r"(error|exception|traceback|failed|cannot|no such file)",
+    re.IGNORECASE,
+)
+
+
 def _extract_error_patterns(sessions: list[dict]) -> Counter:
     """Count recurring error signatures across sessions."""
     errors: Counter = Counter()
-    error_re = re.compile(
-        r"(error|exception|traceback|failed|cannot|no such file)",
-        re.IGNORECASE,
-    )
+    search = _ERROR_LINE_RE.search
     for session in sessions:
-        seen_in_session: set[str] = set()
-        for msg in session.get("messages", []):
-            content = str(msg.get("content", ""))
-            for line in content.splitlines():
-                if error_re.search(line):
-                    key = line.strip()[:80]
-                    if key and key not in seen_in_session:
-                        seen_in_session.add(key)
-                        errors[key] += 1
+        # Each signature counts once per session; dict keys dedupe like a set
+        # but keep first-seen order, so most_common() ties stay deterministic.
+        seen_in_session = dict.fromkeys(
+            key
+            for msg in session.get("messages", [])
+            for line in str(msg.get("content", "")).splitlines()
+            if search(line) and (key := line.strip()[:80])
+        )
+        errors.update(seen_in_session.keys())
     return errors
 
 
@@ -85,10 +93,7 @@ def _extract_conventions(sessions: list[dict]) -> list[str]:
 
 def _effective_tool_sequences(sequences: list[list[str]]) -> list[tuple[str, ...]]:
     """Return the most common 2-grams of tool calls."""
-    bigrams: Counter = Counter()
-    for seq in sequences:
-        for i in range(len(seq) - 1):
-            bigrams[(seq[i], seq[i + 1])] += 1
+    bigrams = Counter(chain.from_iterable(zip(seq, seq[1:]) for seq in sequences))
     return [pair for pair, count in bigrams.most_common(10) if count >= 2]
 
 
@@ -104,11 +109,8 @@ def _compute_dataset_health(sessions: list[dict]) -> dict:
     }
 
 
-def synthesize(sessions: list[dict], project_name: str, project_root: Path) -> Path:
-    """Analyze *sessions* and write ``CODECLAW.md`` under *project_root*.
-
-    Returns the path to the written file.
-    """
+def render_codeclaw_md(sessions: list[dict], project_name: str) -> str:
+    """Analyze *sessions* and return the ``CODECLAW.md`` content for *project_name*."""
     now = datetime.now(tz=timezone.utc).strftime("%Y-%m-%d")
     health = _compute_dataset_health(sessions)
     total = health["total_sessions"]
@@ -170,10 +172,16 @@ def synthesize(sessions: list[dict], project_name: str, project_root: Path) -> P
     if len(lines) > MAX_LINES:
         lines = lines[:MAX_LINES]
 
-    content = "\n".join(lines) + "\n"
+    return "\n".join(lines) + "\n"
+
 
+def synthesize(sessions: list[dict], project_name: str, project_root: Path) -> Path:
+    """Analyze *sessions* and write ``CODECLAW.md`` under *project_root*.
+
+    Returns the path to the written file.
+    """
     out_path = project_root / "CODECLAW.md"
-    out_path.write_text(content, encoding="utf-8")
+    out_path.write_text(render_codeclaw_md(sessions, project_name), encoding="utf-8")
     return out_path
 
 
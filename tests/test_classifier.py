@@ -43,3 +43,13 @@ def test_classifies_iterative_build():
 def test_classifies_sft_clean_default():
     session = {"messages": [{"role": "user", "content": "hello"}]}
     assert classify_trajectory(session) == "sft_clean"
+
+
+def test_opening_user_message_is_not_a_correction():
+    session = {
+        "messages": [
+            {"role": "user", "content": "Please REFACTOR and fix the parser"},
+            {"role": "assistant", "content": "ok"},
+        ]
+    }
+    assert classify_trajectory(session) == "refactor"
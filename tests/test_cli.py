@@ -26,6 +26,7 @@ from codeclaw.cli import (
     list_projects,
     main,
     push_to_huggingface,
+    update_skill,
 )
 
 
@@ -1116,3 +1117,73 @@ class TestConfigCommandDatasetFlags:
         main()
         assert "my-proj" not in saved["disabled_projects"]
         assert "other" in saved["disabled_projects"]
+
+
+class TestUpdateSkill:
+    class _FakeResponse:
+        def __init__(self, body: bytes, etag: str = '"v1"'):
+            self._body = body
+            self.headers = {"ETag": etag, "Last-Modified": "Wed, 01 Jan 2026 00:00:00 GMT"}
+
+        def read(self):
+            return self._body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    @pytest.fixture
+    def skill_env(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        monkeypatch.setattr("codeclaw.cli.update.SKILL_META_FILE", tmp_path / "meta" / "skill_meta.json")
+        requests = []
+
+        def _install(responder):
+            def _fake_urlopen(request, timeout=None):
+                requests.append(request)
+                return responder(request)
+
+            monkeypatch.setattr("codeclaw.cli.update.urllib.request.urlopen", _fake_urlopen)
+            return requests
+
+        return tmp_path / ".claude" / "skills" / "codeclaw" / "SKILL.md", _install
+
+    def test_first_install_writes_file(self, skill_env):
+        dest, install = skill_env
+        requests = install(lambda _req: self._FakeResponse(b"# skill v1\n"))
+
+        update_skill("claude")
+
+        assert dest.read_bytes() == b"# skill v1\n"
+        assert requests[-1].get_header("If-none-match") is None
+
+    def test_second_run_sends_conditional_get_and_handles_304(self, skill_env, capsys):
+        import urllib.error
+
+        dest, install = skill_env
+        install(lambda _req: self._FakeResponse(b"# skill v1\n"))
+        update_skill("claude")
+
+        def _not_modified(req):
+            raise urllib.error.HTTPError(req.full_url, 304, "Not Modified", {}, None)
+
+        requests = install(_not_modified)
+        update_skill("claude")
+
+        assert requests[-1].get_header("If-none-match") == '"v1"'
+        assert dest.read_bytes() == b"# skill v1\n"
+        assert "already up to date" in capsys.readouterr().out
+
+    def test_locally_edited_skill_is_fetched_unconditionally(self, skill_env):
+        dest, install = skill_env
+        install(lambda _req: self._FakeResponse(b"# skill v1\n"))
+        update_skill("claude")
+        dest.write_bytes(b"local edits\n")
+
+        requests = install(lambda _req: self._FakeResponse(b"# skill v1\n"))
+        update_skill("claude")
+
+        assert requests[-1].get_header("If-none-match") is None
+        assert dest.read_bytes() == b"# skill v1\n"
@@ -24,6 +24,9 @@ class _DummyGraphIndex:
     def __init__(self, sessions):
         self._sessions = sessions
 
+    def build(self, sessions):
+        self._sessions = sessions
+
     def query(self, _nodes, max_results=5):
         return self._sessions[:max_results]
 
@@ -47,6 +50,28 @@ class _DummySessionService:
     def index(self):
         return self._index
 
+    def get(self, session_id):
+        return next((s for s in self._sessions if str(s.get("session_id")) == session_id), None)
+
+    def project_patterns(self):
+        return mcp_server._build_project_patterns(self._sessions)
+
+    def trajectory_counts(self, classify_fn):
+        counts = {}
+        for session in self._sessions:
+            label = classify_fn(session)
+            counts[label] = counts.get(label, 0) + 1
+        return counts
+
+    def summary(self, session, rank=None):
+        return mcp_server._session_summary(session, rank=rank)
+
+    def search(self, needle, max_results):
+        return [
+            session for session in self._sessions
+            if any(needle in str(m.get("content", "")).lower() for m in session["messages"])
+        ][:max_results]
+
     def meta(self):
         return {
             "session_count": len(self._sessions),
@@ -84,6 +109,15 @@ def _sample_sessions():
     ]
 
 
+def _real_service(sessions):
+    return mcp_server.SessionIndexService(
+        discover_projects_fn=lambda: [{"dir_name": "proj", "source": "claude"}],
+        parse_project_sessions_fn=lambda *_args, **_kwargs: sessions,
+        anonymizer_factory=lambda _extra: None,
+        graph_index_factory=lambda: _DummyGraphIndex(sessions),
+    )
+
+
 def _build_dummy_server(monkeypatch, service):
     monkeypatch.setattr(mcp_server, "_get_mcp_or_exit", lambda: _DummyFastMCP)
     return mcp_server.create_mcp_server(
@@ -188,6 +222,14 @@ def test_parse_context_nodes_deduplicates_and_flags_invalid():
     assert invalid == ["badnode"]
 
 
+def test_parse_context_nodes_trims_and_lowercases():
+    nodes, invalid = mcp_server._parse_context_nodes(
+        " TOOL: Bash ,file:C:/Repo/App.py,, tool :x, error: ,Tool:bash"
+    )
+    assert nodes == ["tool:bash", "file:c:/repo/app.py"]
+    assert invalid == ["tool :x", "error:"]
+
+
 def test_mcp_search_payload_shape(monkeypatch):
     server = _build_dummy_server(monkeypatch, _DummySessionService(_sample_sessions()))
     payload = json.loads(server.tools["search_past_solutions"]("login", max_results=5))
@@ -215,3 +257,256 @@ def test_mcp_refresh_index_returns_meta(monkeypatch):
     assert payload["ok"] is True
     assert payload["meta"]["refresh_count"] == 1
     assert payload["meta"]["session_count"] == 2
+
+
+class TestSessionIndexServiceSearch:
+    def test_matches_substrings_inside_words(self):
+        service = _real_service(_sample_sessions())
+        assert [s["session_id"] for s in service.search("logi", 5)] == ["s-1"]
+        assert [s["session_id"] for s in service.search("ogin middle", 5)] == ["s-1"]
+
+    def test_phrase_must_appear_in_one_message(self):
+        service = _real_service(_sample_sessions())
+        assert service.search("middleware investigating", 5) == []
+        assert service.search("no such words", 5) == []
+
+    def test_matches_project_name_and_keeps_session_order(self):
+        service = _real_service(_sample_sessions())
+        assert [s["session_id"] for s in service.search("proj-", 5)] == ["s-1", "s-2"]
+        assert [s["session_id"] for s in service.search("proj-", 1)] == ["s-1"]
+
+    def test_stopword_fragments_and_punctuation_still_match(self):
+        sessions = _sample_sessions()
+        sessions[1]["messages"][0]["content"] = "Implement the dashboard -> now"
+        service = _real_service(sessions)
+        assert [s["session_id"] for s in service.search("th", 5)] == ["s-2"]
+        assert [s["session_id"] for s in service.search("->", 5)] == ["s-2"]
+
+
+class TestSessionIndexServiceSummary:
+    def test_summary_built_once_and_copied_per_call(self):
+        sessions = _sample_sessions()
+        service = _real_service(sessions)
+        service.refresh()
+
+        first = service.summary(sessions[0], rank=1)
+        second = service.summary(sessions[0])
+        assert first == {**mcp_server._session_summary(sessions[0]), "rank": 1}
+        assert "rank" not in second
+
+        sessions[0]["messages"].append({"role": "assistant", "tool_uses": [{"tool": "Bash"}]})
+        assert service.summary(sessions[0])["tool_sequence"] == ["Read"]
+
+    def test_unknown_session_falls_back_to_fresh_summary(self):
+        service = _real_service(_sample_sessions())
+        service.refresh()
+        other = _sample_sessions()[1]
+        assert service.summary(other, rank=2)["rank"] == 2
+
+
+def test_mcp_project_patterns_counts_and_filter(monkeypatch):
+    sessions = _sample_sessions()
+    sessions.append({
+        "session_id": "s-3",
+        "project": "proj-a",
+        "messages": [{"role": "assistant", "tool_uses": [{"tool": "Read"}, {"tool": " "}, {"tool": "Bash"}]}],
+    })
+    server = _build_dummy_server(monkeypatch, _real_service(sessions))
+
+    payload = json.loads(server.tools["get_project_patterns"]())
+    assert payload["results"] == {
+        "proj-a": {"session_count": 2, "tool_counts": {"Read": 2, "Bash": 1}},
+        "proj-b": {"session_count": 1, "tool_counts": {"Write": 1}},
+    }
+
+    filtered = json.loads(server.tools["get_project_patterns"]("proj-b"))
+    assert list(filtered["results"]) == ["proj-b"]
+    assert filtered["meta"]["matched_projects"] == 1
+
+    unknown = json.loads(server.tools["get_project_patterns"]("proj-z"))
+    assert unknown["results"] == {}
+
+
+def test_trajectory_counts_classified_once_per_refresh():
+    calls = []
+
+    def classify(session):
+        calls.append(session["session_id"])
+        return str(session["trajectory_type"])
+
+    service = _real_service(_sample_sessions())
+    expected = {"debugging_trace": 1, "iterative_build": 1}
+    assert service.trajectory_counts(classify) == expected
+    assert service.trajectory_counts(classify) == expected
+    assert calls == ["s-1", "s-2"]
+
+    service.refresh()
+    service.trajectory_counts(classify)
+    assert calls == ["s-1", "s-2", "s-1", "s-2"]
+
+
+def test_mcp_get_session_by_id(monkeypatch):
+    sessions = _sample_sessions()
+    sessions.append({**sessions[0], "project": "duplicate"})
+    server = _build_dummy_server(monkeypatch, _real_service(sessions))
+
+    payload = json.loads(server.tools["get_session"](" s-1 "))
+    assert payload["ok"] is True
+    assert payload["results"]["project"] == "proj-a"
+
+    missing = json.loads(server.tools["get_session"]("s-404"))
+    assert missing["error"]["code"] == "session_not_found"
+
+
+def test_refresh_parses_projects_in_order_with_one_shared_anonymizer():
+    projects = [{"dir_name": f"p{i}", "source": "claude"} for i in range(20)]
+    anonymizers = []
+
+    def make_anonymizer(_extra):
+        anonymizer = object()
+        anonymizers.append(anonymizer)
+        return anonymizer
+
+    def parse(dir_name, anonymizer, include_thinking, source):
+        assert anonymizer is anonymizers[0]
+        assert include_thinking is False
+        return [{"session_id": dir_name, "project": dir_name, "messages": []}]
+
+    service = mcp_server.SessionIndexService(
+        discover_projects_fn=lambda: projects,
+        parse_project_sessions_fn=parse,
+        anonymizer_factory=make_anonymizer,
+        graph_index_factory=lambda: _DummyGraphIndex([]),
+    )
+    meta = service.refresh()
+    service.refresh()
+
+    assert [s["session_id"] for s in service.sessions()] == [p["dir_name"] for p in projects]
+    assert meta["project_count"] == 20
+    assert len(anonymizers) == 1
+
+
+def test_payloads_are_compact_and_keep_unicode():
+    payload = mcp_server._ok_payload([{"project": "café"}], returned=1)
+    assert "\n" not in payload
+    assert "café" in payload
+    assert json.loads(payload) == {"ok": True, "results": [{"project": "café"}], "meta": {"returned": 1}}
+
+
+def test_payloads_escape_lone_surrogates_and_keep_big_ints():
+    results = [{"content": "bad \udcff byte", "tokens": 2**70}]
+    payload = mcp_server._ok_payload(results)
+    payload.encode("utf-8")  # writable to stdout
+    assert json.loads(payload)["results"] == results
+
+
+def test_big_int_payloads_keep_unicode():
+    payload = mcp_server._ok_payload([{"project": "café", "tokens": 2**70}])
+    assert "café" in payload
+    assert json.loads(payload)["results"][0]["tokens"] == 2**70
+
+
+def test_install_mcp_leaves_current_registration_untouched(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    mcp_server.install_mcp()
+    config_path = tmp_path / ".claude" / "mcp.json"
+    compact = json.dumps(json.loads(config_path.read_text(encoding="utf-8")))
+    config_path.write_text(compact, encoding="utf-8")
+
+    mcp_server.install_mcp()
+
+    assert config_path.read_text(encoding="utf-8") == compact
+
+
+def test_concurrent_refreshes_publish_consistent_snapshots():
+    import threading
+
+    service = _real_service(_sample_sessions())
+    assert service.meta()["refresh_count"] == 0
+
+    threads = [threading.Thread(target=service.refresh) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.meta()["refresh_count"] == 8
+    assert service.meta()["session_count"] == 2
+    assert service.get("s-2")["project"] == "proj-b"
+
+
+def test_install_mcp_backs_up_non_utf8_config_byte_for_byte(monkeypatch, tmp_path):
+    monkeypatch.setattr(Path, "home", lambda: tmp_path)
+    config_path = tmp_path / ".claude" / "mcp.json"
+    config_path.parent.mkdir(parents=True, exist_ok=True)
+    config_path.write_bytes(b'{"mcpServers": "\xff"}')
+
+    mcp_server.install_mcp()
+
+    backup_path = tmp_path / ".claude" / "mcp.json.corrupt.bak"
+    assert backup_path.read_bytes() == b'{"mcpServers": "\xff"}'
+    assert "codeclaw" in json.loads(config_path.read_text(encoding="utf-8"))["mcpServers"]
+
+
+def test_mcp_find_similar_sessions_skips_query_for_unknown_nodes(monkeypatch):
+    service = _DummySessionService(_sample_sessions())
+    server = _build_dummy_server(monkeypatch, service)
+
+    def fail_query(*_args, **_kwargs):
+        raise AssertionError("query should not run")
+
+    monkeypatch.setattr(service.index(), "has_node", lambda node: node != "error:unseen", raising=False)
+    monkeypatch.setattr(service.index(), "query", fail_query)
+    payload = json.loads(server.tools["find_similar_sessions"]("error:unseen"))
+
+    assert payload["ok"] is True
+    assert payload["results"] == []
+    assert payload["meta"]["context_nodes"] == ["error:unseen"]
+
+
+def test_mcp_find_similar_sessions_queries_index_without_has_node(monkeypatch):
+    service = _DummySessionService(_sample_sessions())
+    server = _build_dummy_server(monkeypatch, service)
+
+    assert not hasattr(service.index(), "has_node")
+    payload = json.loads(server.tools["find_similar_sessions"]("error:unseen"))
+    assert payload["ok"] is True
+    assert payload["results"]
+
+
+def test_meta_index_stats_computed_once_per_refresh():
+    calls = []
+
+    class _CountingIndex(_DummyGraphIndex):
+        def stats(self):
+            calls.append(1)
+            return super().stats()
+
+    sessions = _sample_sessions()
+    service = mcp_server.SessionIndexService(
+        discover_projects_fn=lambda: [{"dir_name": "proj", "source": "claude"}],
+        parse_project_sessions_fn=lambda *_args, **_kwargs: sessions,
+        anonymizer_factory=lambda _extra: None,
+        graph_index_factory=lambda: _CountingIndex(sessions),
+    )
+    service.refresh()
+    for _ in range(3):
+        meta = service.meta()
+        meta["index_stats"] = "mutated by caller"
+
+    assert len(calls) == 1
+    assert service.meta()["index_stats"]["sessions"] == 2
+
+
+def test_terms_containing_uses_trigrams_without_missing_matches():
+    term_index = {term: {0} for term in ("login", "logging", "blog", "dialog", "lo")}
+    trigram_index = mcp_server._build_trigram_index(term_index)
+
+    def terms(token):
+        return sorted(mcp_server._terms_containing(token, term_index, trigram_index))
+
+    assert terms("log") == ["blog", "dialog", "logging", "login"]
+    assert terms("ogi") == ["login"]
+    assert terms("ggin") == ["logging"]
+    assert terms("lo") == ["blog", "dialog", "lo", "logging", "login"]
+    assert terms("xyz") == []
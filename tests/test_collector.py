@@ -0,0 +1,103 @@
+"""Tests for codeclaw.collector — incremental session collection."""
+
+import json
+
+import pytest
+
+from codeclaw import collector
+
+
+@pytest.fixture
+def projects_dir(tmp_path, monkeypatch):
+    projects = tmp_path / "projects"
+    (projects / "-Users-testuser-app").mkdir(parents=True)
+    monkeypatch.setattr("codeclaw.parser.PROJECTS_DIR", projects)
+    monkeypatch.setattr("codeclaw.parser.CODEX_SESSIONS_DIR", tmp_path / "no-codex-sessions")
+    monkeypatch.setattr("codeclaw.parser.CODEX_ARCHIVED_DIR", tmp_path / "no-codex-archived")
+    monkeypatch.setattr("codeclaw.parser._CODEX_PROJECT_INDEX", {})
+    monkeypatch.setattr(collector, "_PARSE_CACHE", {})
+    return projects
+
+
+def _write_session(project_path, session_id, text="hello"):
+    entry = {
+        "type": "user",
+        "timestamp": 1706000000000,
+        "sessionId": session_id,
+        "message": {"content": text},
+    }
+    (project_path / f"{session_id}.jsonl").write_text(json.dumps(entry) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+    original = collector.parse_project_sessions
+
+    def _counting_parse(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(collector, "parse_project_sessions", _counting_parse)
+    return calls
+
+
+class TestCollectNewSessions:
+    def test_skips_synced_ids(self, projects_dir, parse_calls):
+        project = projects_dir / "-Users-testuser-app"
+        _write_session(project, "s1")
+        _write_session(project, "s2")
+
+        sessions = collector.collect_new_sessions({"synced_session_ids": ["s1"]})
+        assert [s["session_id"] for s in sessions] == ["s2"]
+
+    def test_unchanged_project_reuses_cached_parse(self, projects_dir, parse_calls):
+        _write_session(projects_dir / "-Users-testuser-app", "s1")
+
+        collector.collect_new_sessions({})
+        collector.collect_new_sessions({})
+        assert len(parse_calls) == 1
+
+    def test_cached_sessions_not_mutated_by_callers(self, projects_dir, parse_calls):
+        _write_session(projects_dir / "-Users-testuser-app", "s1", text="token sk-secret")
+
+        first = collector.collect_new_sessions({})[0]
+        first["project"] = "changed"
+        first["messages"][0]["content"] = "[REDACTED]"
+
+        again = collector.collect_new_sessions({})[0]
+        assert again["project"] != "changed"
+        assert again["messages"][0]["content"] == "token sk-secret"
+        assert len(parse_calls) == 1
+
+    def test_parse_cache_is_bounded(self, projects_dir, parse_calls, monkeypatch):
+        monkeypatch.setattr(collector, "_PARSE_CACHE_MAX_PROJECTS", 2)
+        for name in ("-Users-testuser-a", "-Users-testuser-b", "-Users-testuser-c"):
+            (projects_dir / name).mkdir()
+            _write_session(projects_dir / name, f"s{name[-1]}")
+
+        collector.collect_new_sessions({})
+        assert len(collector._PARSE_CACHE) == 2
+
+    def test_new_session_file_invalidates_cache(self, projects_dir, parse_calls):
+        project = projects_dir / "-Users-testuser-app"
+        _write_session(project, "s1")
+        assert collector.count_pending_sessions({}) == 1
+
+        _write_session(project, "s2")
+        assert collector.count_pending_sessions({}) == 2
+        assert len(parse_calls) == 2
+
+
+class TestHasPendingSessions:
+    def test_false_when_everything_synced(self, projects_dir, parse_calls):
+        _write_session(projects_dir / "-Users-testuser-app", "s1")
+        assert collector.has_pending_sessions({"synced_session_ids": ["s1"]}) is False
+
+    def test_stops_after_first_pending_project(self, projects_dir, parse_calls):
+        for name in ("-Users-testuser-a", "-Users-testuser-b"):
+            (projects_dir / name).mkdir()
+            _write_session(projects_dir / name, f"s{name[-1]}")
+
+        assert collector.has_pending_sessions({}) is True
+        assert len(parse_calls) == 1
@@ -4,7 +4,7 @@ import json
 
 import pytest
 
-from codeclaw.config import load_config, save_config
+from codeclaw.config import get_synced_session_ids, load_config, save_config
 
 
 class TestLoadConfig:
@@ -69,3 +69,63 @@ class TestSaveConfig:
         save_config({"repo": "test"})
         captured = capsys.readouterr()
         assert "Warning" in captured.err
+
+
+class TestSyncedSessionIds:
+    def test_saved_to_sidecar_not_config_json(self, tmp_config):
+        save_config({"repo": "alice/data", "synced_session_ids": ["b", "a"]})
+        data = json.loads(tmp_config.read_text())
+        assert "synced_session_ids" not in data
+        sidecar = tmp_config.parent / "synced_ids.txt"
+        assert sidecar.read_text().splitlines() == ["a", "b"]
+
+    def test_round_trip(self, tmp_config):
+        save_config({"synced_session_ids": ["s1", "s2"]})
+        assert get_synced_session_ids(load_config()) == {"s1", "s2"}
+
+    def test_saves_add_to_sidecar(self, tmp_config):
+        save_config({"synced_session_ids": ["s1"]})
+        save_config({"synced_session_ids": ["s2"]})
+        save_config(load_config())
+        assert get_synced_session_ids(load_config()) == {"s1", "s2"}
+
+    def test_unchanged_sidecar_reused(self, tmp_config):
+        save_config({"synced_session_ids": ["s1"]})
+        assert get_synced_session_ids(load_config()) is get_synced_session_ids({})
+
+    def test_legacy_inline_ids_merged(self, tmp_config):
+        tmp_config.parent.mkdir(parents=True, exist_ok=True)
+        tmp_config.write_text(json.dumps({"synced_session_ids": ["old"]}))
+        (tmp_config.parent / "synced_ids.txt").write_text("new\n")
+        config = load_config()
+        assert get_synced_session_ids(config) == {"new", "old"}
+
+        save_config(config)
+        assert "synced_session_ids" not in json.loads(tmp_config.read_text())
+        assert get_synced_session_ids(load_config()) == {"new", "old"}
+
+
+class TestSaveConfigWrites:
+    def test_unchanged_config_still_chmodded(self, tmp_config):
+        save_config({"repo": "alice/data"})
+        tmp_config.chmod(0o644)
+        save_config({"repo": "alice/data"})
+        assert tmp_config.stat().st_mode & 0o777 == 0o600
+
+    def test_no_temp_files_left(self, tmp_config):
+        save_config({"repo": "alice/data", "synced_session_ids": ["s1"]})
+        save_config({"repo": "bob/data"})
+        assert sorted(p.name for p in tmp_config.parent.iterdir()) == ["config.json", "synced_ids.txt"]
+
+    def test_unchanged_config_not_rewritten(self, tmp_config):
+        save_config({"repo": "alice/data"})
+        before = tmp_config.stat().st_mtime_ns
+        save_config({"repo": "alice/data"})
+        assert tmp_config.stat().st_mtime_ns == before
+
+    def test_atomic_write_leaves_no_temp_file(self, tmp_config):
+        save_config({"repo": "alice/data"})
+        save_config({"repo": "bob/data"})
+        assert json.loads(tmp_config.read_text())["repo"] == "bob/data"
+        assert not (tmp_config.parent / "config.json.tmp").exists()
+        assert tmp_config.stat().st_mode & 0o777 == 0o600
@@ -41,6 +41,14 @@ class TestFormatSession:
         assert result["messages"][0]["content"] == "visible text"
         assert "thinking_trace" in result["metadata"]
 
+    def test_untagged_content_still_stripped(self):
+        session = {
+            "session_id": "abc",
+            "messages": [{"role": "assistant", "content": "  plain answer\n"}],
+        }
+        result = format_session(session)
+        assert result["messages"][0]["content"] == "plain answer"
+
     def test_empty_messages(self):
         session = {"session_id": "abc", "messages": []}
         result = format_session(session)
@@ -86,3 +94,19 @@ class TestWriteJsonl:
         ]
         count = write_jsonl(sessions, output)
         assert count == 2
+        lines = output.read_bytes().splitlines()
+        assert [json.loads(line) for line in lines] == [format_session(s) for s in sessions]
+
+    def test_write_preserves_unicode(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        sessions = [{"session_id": "a", "messages": [{"role": "user", "content": "héllo ✓"}]}]
+        write_jsonl(sessions, output)
+        line = output.read_text(encoding="utf-8").strip()
+        assert "héllo ✓" in line
+        assert json.loads(line)["messages"][0]["content"] == "héllo ✓"
+
+    def test_write_lone_surrogates_and_big_ints(self, tmp_path):
+        output = tmp_path / "out.jsonl"
+        session = {"messages": [{"role": "user", "content": "bad \udcff byte"}], "metadata": {"n": 2**70}}
+        assert write_jsonl([session], output) == 1
+        assert json.loads(output.read_text(encoding="utf-8")) == session
@@ -1,5 +1,6 @@
 """Tests for codeclaw.graph_index — graph-structured tool-call indexing."""
 
+import io
 import json
 from pathlib import Path
 
@@ -11,12 +12,28 @@ from codeclaw.graph_index import (
     _file_node,
     _error_node,
     _normalize_node,
+    _extract_edges,
+    _extract_error_refs,
+    _extract_file_refs,
     build_index_from_jsonl,
 )
 
 
+try:
+    from orjson import dumps as _dumps_bytes  # type: ignore
+except ImportError:  # pragma: no cover — orjson optional
+    def _dumps_bytes(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+
 # --- Helpers ---
 
+def _write_jsonl(path: Path, *sessions: dict, extra: bytes = b"") -> Path:
+    """Write *sessions* as JSONL in one call, followed by any raw *extra* bytes."""
+    path.write_bytes(b"".join(_dumps_bytes(s) + b"\n" for s in sessions) + extra)
+    return path
+
+
 def _make_session(
     session_id: str = "sess-1",
     trajectory_type: str = "sft_clean",
@@ -56,12 +73,60 @@ class TestNodeHelpers:
     def test_normalize_node_strips(self):
         assert _normalize_node("  Bash  ") == "bash"
 
+    def test_nodes_interned_across_cache_evictions(self):
+        first = _tool_node("Read")
+        _tool_node.cache_clear()
+        assert _tool_node(" READ ") is first
+
     def test_error_node_truncates(self):
         long_msg = "Error: " + "x" * 200
         node = _error_node(long_msg)
         assert len(node) < 80  # prefix + 60 chars max
 
 
+# --- Content reference extraction ---
+
+class TestExtractContentRefs:
+    TEXT = "Opened src/auth.py\nTraceback: boom in app/db.py\nall good\nError: missing cfg.yaml"
+
+    def test_file_refs(self):
+        assert _extract_file_refs(self.TEXT) == ["src/auth.py", "app/db.py", "cfg.yaml"]
+
+    def test_error_refs(self):
+        assert _extract_error_refs(self.TEXT) == ["Traceback: boom in app/db.py", "Error: missing cfg.yaml"]
+
+    def test_prose_without_extension_has_no_file_refs(self):
+        assert _extract_file_refs("just some words / and slashes") == []
+
+    @pytest.mark.parametrize("sep", ["\r", "\r\n", "\x0c", "\u2028"])
+    def test_error_lines_split_on_any_line_break(self, sep):
+        text = sep.join(["Downloading 10%", "Downloading 100%", "Error: pkg install failed", "done"])
+        assert _extract_error_refs(text) == ["Error: pkg install failed"]
+
+    def test_errors_only_indexed_for_user_and_tool_output(self):
+        session = _make_session(tool_names=["Read"], content="Error: missing cfg.yaml")
+        assert not any(src.startswith("error:") for src, _, _ in _extract_edges(session))
+        session["messages"][0]["role"] = "tool_result"
+        assert ("error:error: missing cfg.yaml", "error:error: missing cfg.yaml", "self") in _extract_edges(session)
+
+
+# --- Edge extraction ---
+
+class TestExtractEdges:
+    def test_tool_sequence_edges(self):
+        edges = _extract_edges(_make_session(tool_names=["Read", "Bash"]))
+        assert ("tool:read", "tool:bash", "led_to_success") in edges
+
+    def test_correction_loop_edges_are_co_occurs(self):
+        session = _make_session(trajectory_type="correction_loop", tool_names=["Read", "Bash"])
+        assert ("tool:read", "tool:bash", "co-occurs") in _extract_edges(session)
+
+    def test_file_to_tool_edge(self):
+        session = _make_session(tool_names=["Read"])
+        session["messages"][0]["tool_uses"][0]["input"] = "src/auth.py"
+        assert ("file:src/auth.py", "tool:read", "accessed_by") in _extract_edges(session)
+
+
 # --- GraphIndex.build ---
 
 class TestGraphIndexBuild:
@@ -88,6 +153,18 @@ class TestGraphIndexBuild:
         index.build(sessions)
         assert index.stats()["sessions"] == 2
 
+    def test_repeated_edges_accumulate_weight(self):
+        sessions = [
+            _make_session(session_id="s1", tool_names=["Read", "Bash"]),
+            _make_session(session_id="s2", tool_names=["Read", "Bash"]),
+        ]
+        index = GraphIndex()
+        index.build(sessions)
+        index.add_session(_make_session(session_id="s3", tool_names=["Read", "Bash"]))
+        edge = index._graph["tool:read"]["tool:bash"]
+        assert edge["weight"] == 3
+        assert edge["rel"] == "led_to_success"
+
     def test_rebuild_resets(self):
         index = GraphIndex()
         index.build([_make_session(session_id="s1", tool_names=["Read"])])
@@ -113,57 +190,93 @@ class TestGraphIndexAddSession:
         # Both entries added; session dict overwritten but edges accumulate
         assert index.stats()["sessions"] >= 1
 
+    def test_add_session_work_is_per_session(self, monkeypatch):
+        """Guard against an accidental O(n) step per insert (O(n^2) overall)."""
+        from codeclaw.graph_index import _Graph
 
-# --- GraphIndex.query ---
+        edge_calls = []
+        add_edge = _Graph.add_edge
 
-class TestGraphIndexQuery:
-    def test_query_empty_index(self):
-        index = GraphIndex()
-        result = index.query(["tool:read"])
-        assert result == []
+        def counting_add_edge(self, *args, **kwargs):
+            edge_calls.append(args)
+            add_edge(self, *args, **kwargs)
 
-    def test_query_empty_context(self):
+        monkeypatch.setattr(_Graph, "add_edge", counting_add_edge)
         index = GraphIndex()
-        index.build([_make_session(tool_names=["Read"])])
-        result = index.query([])
-        assert result == []
+        for i in range(1000):
+            index.add_session(_make_session(session_id=f"s{i}", tool_names=["Read", "Bash"]))
 
-    def test_exact_tool_match(self):
-        s1 = _make_session(session_id="s1", tool_names=["Read", "Bash"])
-        s2 = _make_session(session_id="s2", tool_names=["Write"])
-        index = GraphIndex()
-        index.build([s1, s2])
+        # One Read→Bash edge per session, never a replay of earlier sessions
+        assert len(edge_calls) == 1000
+        # Node → sessions membership is a hashed map, not a list to scan
+        sessions = index._node_to_sessions["tool:read"]
+        assert isinstance(sessions, dict)
+        assert len(sessions) == 1000
 
-        results = index.query(["tool:read"])
-        session_ids = [r["session_id"] for r in results]
-        assert "s1" in session_ids
 
-    def test_max_results_respected(self):
-        sessions = [
-            _make_session(session_id=f"s{i}", tool_names=["Read"])
-            for i in range(10)
-        ]
-        index = GraphIndex()
-        index.build(sessions)
-        results = index.query(["tool:read"], max_results=3)
-        assert len(results) <= 3
+# --- GraphIndex.query ---
 
-    def test_no_match_returns_empty(self):
-        index = GraphIndex()
-        index.build([_make_session(tool_names=["Write"])])
-        results = index.query(["tool:bash"])
-        assert results == []
+@pytest.fixture(scope="module")
+def read_bash_index():
+    """A shared, read-only index; query() does not change what it returns."""
+    index = GraphIndex()
+    index.build([
+        _make_session(session_id="s1", tool_names=["Read", "Bash"]),
+        _make_session(session_id="s2", tool_names=["Bash", "Write"]),
+        *(_make_session(session_id=f"r{i}", tool_names=["Read"]) for i in range(5)),
+    ])
+    return index
 
-    def test_neighbor_traversal(self):
-        """Sessions sharing graph neighbors should be returned even without direct match."""
-        s1 = _make_session(session_id="s1", tool_names=["Read", "Bash"])
-        s2 = _make_session(session_id="s2", tool_names=["Bash", "Write"])
+
+@pytest.fixture(scope="module")
+def empty_index():
+    return GraphIndex()
+
+
+class TestGraphIndexQuery:
+    @pytest.mark.parametrize(
+        ("index_fixture", "context"),
+        [
+            pytest.param("empty_index", ["tool:read"], id="empty_index"),
+            pytest.param("read_bash_index", [], id="empty_context"),
+            pytest.param("read_bash_index", ["tool:grep"], id="no_match"),
+        ],
+    )
+    def test_returns_empty(self, request, index_fixture, context):
+        assert request.getfixturevalue(index_fixture).query(context) == []
+
+    def test_exact_tool_match(self, read_bash_index):
+        results = read_bash_index.query(["tool:read"])
+        # s1 has the direct match plus the Bash neighbor, so it ranks first
+        assert results[0]["session_id"] == "s1"
+
+    def test_max_results_respected(self, read_bash_index):
+        assert len(read_bash_index.query(["tool:read"], max_results=3)) == 3
+
+    def test_repeated_query_sees_later_sessions(self):
         index = GraphIndex()
-        index.build([s1, s2])
+        index.build([_make_session(session_id="s1", tool_names=["Read"])])
+        assert [r["session_id"] for r in index.query(["tool:read"])] == ["s1"]
+
+        index.add_session(_make_session(session_id="s2", tool_names=["Read", "Read"]))
+        assert {r["session_id"] for r in index.query(["tool:read"])} == {"s1", "s2"}
 
-        # Query for Read — s1 matches directly; s2 shares Bash neighbor
-        results = index.query(["tool:read"])
-        assert any(r["session_id"] == "s1" for r in results)
+    def test_has_node(self):
+        index = GraphIndex()
+        index.build([_make_session(tool_names=["Read"], content="see src/app.py")])
+        assert index.has_node("tool:read")
+        assert index.has_node("TOOL:Read")
+        assert index.has_node("file:src/app.py")
+        assert not index.has_node("tool:bash")
+        assert not index.has_node("error:never-seen")
+
+    def test_neighbor_traversal(self, read_bash_index):
+        """Sessions sharing graph neighbors should be returned even without direct match."""
+        # Query for Read — s1 matches directly; s2 shares the Bash neighbor
+        results = read_bash_index.query(["tool:read"], max_results=10)
+        session_ids = [r["session_id"] for r in results]
+        assert session_ids[0] == "s1"
+        assert session_ids[-1] == "s2"
 
 
 # --- GraphIndex.stats ---
@@ -186,6 +299,22 @@ class TestGraphIndexStats:
         assert stats["edges"] >= 2  # Read→Bash, Bash→Write
 
 
+    def test_stats_follow_mutations(self):
+        index = GraphIndex()
+        index.build([_make_session(session_id="s1", tool_names=["Read", "Bash"])])
+        first = index.stats()
+        first["sessions"] = 99  # callers get a copy
+        assert index.stats()["sessions"] == 1
+
+        index.add_session(_make_session(session_id="s2", tool_names=["Bash", "Write"]))
+        assert index.stats()["sessions"] == 2
+        assert index.stats()["edges"] == 2
+
+        index.build([])
+        assert index.stats()["sessions"] == 0
+        assert index.stats()["edges"] == 0
+
+
 # --- build_index_from_jsonl ---
 
 class TestBuildIndexFromJsonl:
@@ -193,31 +322,38 @@ class TestBuildIndexFromJsonl:
         index = build_index_from_jsonl([tmp_path / "nonexistent.jsonl"])
         assert index.stats()["sessions"] == 0
 
-    def test_valid_jsonl(self, tmp_path):
-        jsonl_file = tmp_path / "sessions.jsonl"
+    def test_str_paths(self, tmp_path):
+        path = _write_jsonl(tmp_path / "a.jsonl", _make_session(session_id="s1", tool_names=["Read"]))
+        index = build_index_from_jsonl([str(path), str(tmp_path / "missing.jsonl")])
+        assert index.stats()["sessions"] == 1
+
+    def test_valid_jsonl(self):
         session = _make_session(session_id="s1", tool_names=["Read"])
-        jsonl_file.write_text(json.dumps(session) + "\n", encoding="utf-8")
 
-        index = build_index_from_jsonl([jsonl_file])
+        index = build_index_from_jsonl([io.StringIO(json.dumps(session) + "\n")])
         assert index.stats()["sessions"] == 1
 
-    def test_malformed_lines_skipped(self, tmp_path):
-        jsonl_file = tmp_path / "sessions.jsonl"
-        session = _make_session(session_id="s1", tool_names=["Read"])
-        content = json.dumps(session) + "\n" + "not-json\n" + json.dumps(session) + "\n"
-        jsonl_file.write_text(content, encoding="utf-8")
+    def test_malformed_lines_skipped(self):
+        line = _dumps_bytes(_make_session(session_id="s1", tool_names=["Read"]))
+        jsonl = io.BytesIO(line + b"\nnot-json\n   \n" + line + b"\n")
 
-        index = build_index_from_jsonl([jsonl_file])
+        index = build_index_from_jsonl([jsonl])
         # Two valid lines (same session_id overwritten), but no crash
         assert index.stats()["sessions"] >= 1
 
+    def test_crlf_blank_and_invalid_utf8_lines_skipped(self, tmp_path):
+        session = _dumps_bytes(_make_session(session_id="s1", tool_names=["Read"]))
+        jsonl_file = tmp_path / "sessions.jsonl"
+        jsonl_file.write_bytes(session + b"\r\n   \r\n\xff\xfe\n\n")
+
+        index = build_index_from_jsonl([jsonl_file])
+        assert index.stats()["sessions"] == 1
+
     def test_multiple_files(self, tmp_path):
         s1 = _make_session(session_id="s1", tool_names=["Read"])
         s2 = _make_session(session_id="s2", tool_names=["Bash"])
-        f1 = tmp_path / "a.jsonl"
-        f2 = tmp_path / "b.jsonl"
-        f1.write_text(json.dumps(s1) + "\n", encoding="utf-8")
-        f2.write_text(json.dumps(s2) + "\n", encoding="utf-8")
+        f1 = io.BytesIO(_dumps_bytes(s1) + b"\n")
+        f2 = _write_jsonl(tmp_path / "b.jsonl", s2)
 
         index = build_index_from_jsonl([f1, f2])
         assert index.stats()["sessions"] == 2
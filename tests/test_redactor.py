@@ -34,3 +34,30 @@ class TestRedactAllSessions:
         result, count = redact_all_sessions(sessions, custom_strings=["alice@example.com"])
         # The email should be redacted
         assert count > 0
+
+    def test_in_process_by_default(self, monkeypatch):
+        def no_pool(*args, **kwargs):
+            raise AssertionError("pool started without max_workers")
+
+        monkeypatch.setattr("codeclaw._pool.ProcessPoolExecutor", no_pool)
+        monkeypatch.setattr("codeclaw.redactor._PARALLEL_MIN_SESSIONS", 2)
+        sessions = [{"messages": [{"role": "user", "content": f"sk-ant-{'A' * 24}"}]} for _ in range(4)]
+        assert redact_all_sessions(sessions)[1] == 4
+
+    def test_pooled_matches_in_process(self, monkeypatch):
+        monkeypatch.setattr("codeclaw.redactor._PARALLEL_MIN_SESSIONS", 2)
+
+        def make():
+            return [
+                {"session_id": str(i), "messages": [{"role": "user", "content": f"key {i} sk-ant-{'A' * 24}"}]}
+                for i in range(6)
+            ] + [{"session_id": "no-messages"}]
+
+        serial, serial_count = redact_all_sessions(make(), max_workers=1)
+        originals = make()
+        pooled, pooled_count = redact_all_sessions(originals, max_workers=2)
+
+        assert pooled == serial
+        assert "messages" not in pooled[-1]
+        assert pooled_count == serial_count == 6
+        assert all(a is b for a, b in zip(pooled, originals))
@@ -4,6 +4,7 @@ import pytest
 
 from codeclaw.secrets import (
     REDACTED,
+    _custom_string_patterns,
     _has_mixed_char_types,
     _shannon_entropy,
     redact_custom_strings,
@@ -357,6 +358,11 @@ class TestRedactCustomStrings:
         # With no word boundary for 3-char, should match in "fooabc" as escaped substring
         assert count >= 1
 
+    def test_patterns_compiled_once_per_list(self):
+        first = _custom_string_patterns(("Acme Corp", "ab", "a.b"))
+        assert _custom_string_patterns(("Acme Corp", "ab", "a.b")) is first
+        assert [p.pattern for p in first] == [r"\bAcme\ Corp\b", r"a\.b"]
+
 
 # --- redact_session ---
 
@@ -1,5 +1,6 @@
 """Tests for codeclaw.synthesizer — CODECLAW.md synthesizer."""
 
+import json
 from pathlib import Path
 
 import pytest
@@ -12,6 +13,8 @@ from codeclaw.synthesizer import (
     _extract_conventions,
     _extract_error_patterns,
     _extract_tool_sequences,
+    _load_sessions_from_jsonl,
+    render_codeclaw_md,
     synthesize,
 )
 
@@ -44,6 +47,30 @@ def _make_user_msg(content: str = "") -> dict:
     return {"role": "user", "content": content, "tool_uses": []}
 
 
+@pytest.fixture(scope="session")
+def big_error_sessions() -> list[dict]:
+    """Many sessions with recurring errors to inflate line count; built once.
+
+    synthesize() only reads its sessions, so they are safe to share.
+    """
+    messages = [_make_user_msg(f"Error: thing {i} broke badly in module foo") for i in range(2)]
+    return [_make_session(session_id=f"s{i}", messages=list(messages)) for i in range(50)]
+
+
+# --- _load_sessions_from_jsonl ---
+
+class TestLoadSessionsFromJsonl:
+    def test_missing_file(self, tmp_path):
+        assert _load_sessions_from_jsonl(tmp_path / "missing.jsonl") == []
+
+    def test_blank_malformed_and_invalid_utf8_lines_skipped(self, tmp_path):
+        path = tmp_path / "sessions.jsonl"
+        line = json.dumps(_make_session(session_id="s1")).encode("utf-8")
+        path.write_bytes(line + b"\r\n   \nnot-json\n\xff\xfe\n" + line + b"\n")
+        sessions = _load_sessions_from_jsonl(path)
+        assert [s["session_id"] for s in sessions] == ["s1", "s1"]
+
+
 # --- _extract_tool_sequences ---
 
 class TestExtractToolSequences:
@@ -171,6 +198,12 @@ class TestComputeDatasetHealth:
 
 # --- synthesize ---
 
+@pytest.fixture(scope="class")
+def default_md():
+    """CODECLAW.md content for one default session, rendered once per class."""
+    return render_codeclaw_md([_make_session()], "myproject")
+
+
 class TestSynthesize:
     def test_creates_file(self, tmp_path):
         sessions = [_make_session()]
@@ -178,45 +211,33 @@ class TestSynthesize:
         assert out.exists()
         assert out.name == "CODECLAW.md"
 
-    def test_header_present(self, tmp_path):
-        sessions = [_make_session()]
-        out = synthesize(sessions, "myproject", tmp_path)
-        content = out.read_text()
-        assert CODECLAW_MD_HEADER in content
+    def test_header_present(self, default_md):
+        assert default_md.startswith(CODECLAW_MD_HEADER)
 
-    def test_project_name_in_header(self, tmp_path):
-        sessions = [_make_session()]
-        out = synthesize(sessions, "myproject", tmp_path)
-        content = out.read_text()
-        assert "myproject" in content
+    def test_project_name_in_header(self, default_md):
+        assert "# CODECLAW — myproject" in default_md
 
-    def test_session_count_in_health(self, tmp_path):
+    def test_session_count_in_health(self):
         sessions = [
             _make_session(session_id="s1"),
             _make_session(session_id="s2"),
         ]
-        out = synthesize(sessions, "myproject", tmp_path)
-        content = out.read_text()
+        content = render_codeclaw_md(sessions, "myproject")
         assert "2" in content  # total sessions shown
 
-    def test_max_lines_respected(self, tmp_path):
-        # Create many sessions with lots of errors to inflate line count
-        messages = [_make_user_msg(f"Error: thing {i} broke badly in module foo") for i in range(200)]
-        sessions = [_make_session(session_id=f"s{i}", messages=messages[:2]) for i in range(50)]
-        out = synthesize(sessions, "bigproject", tmp_path)
-        content = out.read_text()
+    def test_max_lines_respected(self, big_error_sessions):
+        content = render_codeclaw_md(big_error_sessions, "bigproject")
         assert len(content.splitlines()) <= MAX_LINES
 
-    def test_recurring_bugs_section(self, tmp_path):
+    def test_recurring_bugs_section(self):
         msg = _make_user_msg("Error: database connection failed")
         sessions = [
             _make_session(session_id=f"s{i}", messages=[msg]) for i in range(3)
         ]
-        out = synthesize(sessions, "myproject", tmp_path)
-        content = out.read_text()
+        content = render_codeclaw_md(sessions, "myproject")
         assert "Recurring Bugs" in content
 
-    def test_effective_tool_sequences_section(self, tmp_path):
+    def test_effective_tool_sequences_section(self):
         sessions = [
             _make_session(
                 session_id=f"s{i}",
@@ -224,18 +245,17 @@ class TestSynthesize:
             )
             for i in range(3)
         ]
-        out = synthesize(sessions, "myproject", tmp_path)
-        content = out.read_text()
+        content = render_codeclaw_md(sessions, "myproject")
         assert "Tool-Call Sequences" in content
 
     def test_overwrites_existing(self, tmp_path):
         sessions = [_make_session()]
         out = synthesize(sessions, "myproject", tmp_path)
-        first_content = out.read_text()
+        first_content = out.read_text(encoding="utf-8")
 
         sessions2 = [_make_session(session_id="s2"), _make_session(session_id="s3")]
         out2 = synthesize(sessions2, "myproject", tmp_path)
-        second_content = out2.read_text()
+        second_content = out2.read_text(encoding="utf-8")
 
         assert first_content != second_content
-        assert "2" in second_content  # reflects new session count
+        assert second_content == render_codeclaw_md(sessions2, "myproject")